@@ -0,0 +1,151 @@
+"""
+@author: Mikkel Hviid Thorn og Rebekka Engelund Balle
+
+
+Information
+Modulet indeholder analytiske tilnærmelser til ventetiderne i lufthavnen.
+Flyene ankommer som en poisson proces, og landingstiderne har en fast fordeling, så lufthavnen er en M/G/k kø.
+
+Tilnærmelser:
+- En landingsbane -> Pollaczek-Khinchine formlen for M/G/1, Wq = lambda*E[S^2]/(2*(1-rho)).
+- k landingsbaner -> Allen-Cunneen, Wq = C(k,a)*E[S]/(k-a) * (1+Cs^2)/2, hvor C(k,a) er Erlang C sandsynligheden for at vente.
+For k = 1 giver Allen-Cunneen det samme som Pollaczek-Khinchine.
+
+Tilnærmelserne gælder for en kø i ligevægt. En dag starter med tomme landingsbaner og varer kun 13 timer,
+så ved høj belastning bliver de simulerede ventetider mindre end de analytiske.
+Derfor kan l_år_hybrid simulere de år, hvor tilnærmelsen ikke passer.
+
+
+Ordbog
+- S er landingstiden for et fly, og a = lambda*E[S] er belastningen målt i landingsbaner.
+- rho = a/k er udnyttelsen af hver landingsbane.
+- ventetid er den gennemsnitlige ventetid for de fly, som skal vente, ligesom ventetider i Lufthavns_simulation_module.
+"""
+
+
+from math import factorial
+from functools import lru_cache
+import numpy as np
+import Lufthavns_simulation_module as lsm
+
+
+@lru_cache(maxsize = None) #fordelingen ændres ikke, så momenterne udregnes kun en gang
+def landingstid_momenter():
+    """
+    Udregner første og andet moment for landingstiden ud fra fordelingen i fly.
+    Landingstiden er uniform på heltallene fra 30*i+31 til 30*i+59 i kategori i.
+
+    Output
+    ES -> middelværdien af landingstiden.
+    ES2 -> middelværdien af landingstiden i anden.
+
+    Eksempel
+    >>> landingstid_momenter()
+    (122.7, 17539.0)
+    """
+
+    p = np.array(lsm.LANDINGSVÆGTE)/np.sum(lsm.LANDINGSVÆGTE)
+    værdier = np.arange(8)[:,None]*30 + np.arange(31, 60) #landingstiderne i hver kategori
+    ES = np.sum(p*np.mean(værdier, axis = 1))
+    ES2 = np.sum(p*np.mean(værdier**2.0, axis = 1))
+    return round(float(ES), 10), round(float(ES2), 10)
+
+
+def erlang_c(k, a):
+    """
+    Sandsynligheden for at et fly skal vente i en M/M/k kø med belastningen a.
+
+    Eksempel
+    >>> erlang_c(1, 0.5)
+    0.5
+    """
+
+    if a >= k:
+        return 1.0
+    led = a**k/factorial(k) * k/(k-a)
+    return led/(sum(a**i/factorial(i) for i in range(k)) + led)
+
+
+def analytic_ventetid(n, k=1):
+    """
+    Giver en analytisk tilnærmelse af ventetiden og brøkdelen af fly som venter med n fly om dagen og k landingsbaner.
+
+    Input
+    n -> den gennemsnitlige mængde fly på de 13 timer.
+    k -> antallet af landingsbaner.
+
+    Output
+    ventetid -> den gennemsnitlige ventetid for fly, som skal vente. Den er uendelig hvis a >= k.
+    fly_der_venter -> brøkdelen af fly, som skal vente med at lande.
+
+    Eksempel
+    >>> analytic_ventetid(200)
+    (150.26262200225386, 0.5243589743589744)
+
+    >>> analytic_ventetid(200, 2)
+    (48.43391204416696, 0.10891966506491646)
+    """
+
+    ES, ES2 = landingstid_momenter()
+    a = n/(13*60*60) * ES #belastningen
+    C = erlang_c(k, a)
+
+    if a >= k: #køen vokser uden grænse
+        return np.inf, C
+
+    Cs2 = ES2/ES**2 - 1 #den kvadrerede variationskoefficient for landingstiden
+    Wq = C*ES/(k-a) * (1+Cs2)/2 #gennemsnitlig ventetid for alle fly
+    return Wq/C, C
+
+
+def l_år_hybrid(l,m,n,k=1,tol=0.1,m_pilot=30,backend=None,rng=None,vækst=1.05):
+    """
+    Estimerer ventetiden over l år, hvor der kun simuleres fuldt i de år, hvor den analytiske tilnærmelse ikke passer.
+    For hvert år simuleres m_pilot dage. Hvis ventetiden og brøkdelen af fly der venter afviger relativt mindre end tol
+    fra de analytiske værdier, bruges de analytiske værdier. Ellers simuleres m dage.
+    Stigningen er på 5% hvert år som standard og udregnes med renteformlen.
+
+    Input
+    l -> antallet af år.
+    m -> antallet af dage simuleret i de år, hvor tilnærmelsen ikke passer.
+    n -> skal symbolisere den gennemsnitlige mængde fly.
+    k -> antallet af landingsbaner.
+    tol -> den største relative afvigelse mellem analytisk og simuleret værdi.
+    m_pilot -> antallet af dage simuleret for at tjekke tilnærmelsen.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se Lufthavns_simulation_module.fly.
+    vækst -> faktoren som flytrafikken vokser med hvert år.
+
+    Output
+    liste_ventetid -> en liste med den gennemsnitlige ventetid for fly som venter, hvert år.
+    liste_fly_der_venter -> en liste med brøkdelen af fly som venter, hvert år.
+    liste_simuleret -> en liste som for hvert år er True, hvis værdierne er simuleret med m dage.
+    """
+
+    liste_ventetid, liste_fly_der_venter, liste_simuleret = [], [], [] #setup
+
+    for i in range(0,l+1):
+        n_år = int(n*vækst**i)
+        ventetid, fly_der_venter = analytic_ventetid(n_år, k)
+        pilot = lsm.m_dage_strøm(m_pilot, n_år, k, backend, rng)
+
+        simuleret_pilot = np.array([pilot.mean, pilot.andel_fly_der_venter])
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            afvigelse = np.max(np.abs(simuleret_pilot - [ventetid, fly_der_venter])/simuleret_pilot)
+        simuleret = not afvigelse <= tol #nan og uendelig tæller også som afvigelse
+
+        if simuleret: #tilnærmelsen passer ikke, så året simuleres
+            statistik = lsm.m_dage_strøm(m-m_pilot, n_år, k, backend, rng, pilot) if m > m_pilot else pilot
+            ventetid, fly_der_venter = statistik.mean, statistik.andel_fly_der_venter
+
+        liste_ventetid.append(ventetid)
+        liste_fly_der_venter.append(fly_der_venter)
+        liste_simuleret.append(simuleret)
+
+    return liste_ventetid, liste_fly_der_venter, liste_simuleret
+
+
+
+if  __name__ == '__main__':
+   import doctest
+   print(doctest.testmod())
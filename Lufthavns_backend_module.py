@@ -0,0 +1,348 @@
+"""
+@author: Mikkel Hviid Thorn og Rebekka Engelund Balle
+
+
+Information
+Modulet indeholder kø-rekursionerne fra en_dag og en_dag_2LB som selvstændige kerner.
+Kernerne arbejder på en dags ankomsttider og landingstider og kan køres med forskellige backends.
+Med k landingsbaner gemmes tidspunkterne hvor banerne er fri i en min-heap, så hvert fly koster O(log k).
+
+Backends:
+- numpy -> den oprindelige løkke over rækker i et numpy array. Bruges som reference.
+- python -> en løkke over almindelige python heltal, som er langt hurtigere end at indeksere numpy arrays.
+- numba -> JIT-kompilerede kerner over sammenhængende int32 arrays. Kræver at numba er installeret.
+
+Backenden vælges med backend argumentet eller miljøvariablen LUFTHAVN_BACKEND.
+Standard er 'auto', som bruger numba hvis det er installeret og ellers python.
+Alle backends giver de samme ventetider og den samme lukketid for de samme fly.
+
+
+Ordbog
+- ankomst og landing er arrays med ankomsttider og landingstider for en dag.
+- LB står for landingsbane, og er tidspunktet hvor landingsbanen er fri.
+- k er antallet af landingsbaner.
+"""
+
+
+import os
+import time
+import heapq
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError: #numba er ikke installeret, så der bruges python kernerne
+    njit = None
+
+
+BACKENDS = ('numpy', 'python', 'numba')
+
+
+"""
+Første sektion indeholder kernerne for hver backend.
+"""
+
+
+def _kø_1LB_numpy(ankomst, landing):
+    #den oprindelige løkke fra en_dag
+    LB, ventetider = 0, []
+
+    for f in np.transpose([ankomst, landing]):
+        if f[0] < LB: #landingsbanen er optaget
+            ventetider.append(LB-f[0])
+            LB += f[1]
+        else: #landingsbanen er fri
+            LB = np.sum(f)
+
+    return ventetider, LB
+
+
+def _kø_2LB_numpy(ankomst, landing):
+    #den oprindelige løkke fra en_dag_2LB
+    LB1, LB2, ventetider = 0, 0, []
+
+    for f in np.transpose([ankomst, landing]):
+        if f[0] < LB1: #tjekker om landingsbanerne er optaget
+            if f[0] < LB2:
+                if LB1 <= LB2:
+                    ventetider.append(LB1-f[0])
+                    LB1 += f[1]
+                elif LB2 < LB1:
+                    ventetider.append(LB2-f[0])
+                    LB2 += f[1]
+
+            else: #landingsbaneren er ikke optaget
+                LB2 = np.sum(f)
+        else:
+            LB1 = np.sum(f)
+
+    return ventetider, max(LB1, LB2)
+
+
+def _kø_1LB_python(ankomst, landing):
+    #samme løkke som _kø_1LB_numpy, men over python heltal
+    LB, ventetider = 0, []
+
+    for a, s in zip(ankomst.tolist(), landing.tolist()):
+        if a < LB: #landingsbanen er optaget
+            ventetider.append(LB-a)
+            LB += s
+        else: #landingsbanen er fri
+            LB = a+s
+
+    return ventetider, LB
+
+
+def _kø_k_numpy(ankomst, landing, k):
+    #løkke over rækker i et numpy array med en heap af landingsbaner, bruges som reference når k > 2
+    LB, ventetider = [0]*k, []
+
+    for f in np.transpose([ankomst, landing]):
+        if f[0] < LB[0]: #alle landingsbaner er optaget, og flyet tager den første der bliver fri
+            ventetider.append(LB[0]-f[0])
+            heapq.heapreplace(LB, LB[0]+f[1])
+        else: #en landingsbane er fri
+            heapq.heapreplace(LB, np.sum(f))
+
+    return ventetider, max(LB)
+
+
+def _kø_k_python(ankomst, landing, k):
+    #heap af landingsbaner over python heltal
+    LB, ventetider = [0]*k, []
+
+    for a, s in zip(ankomst.tolist(), landing.tolist()):
+        fri = LB[0] #landingsbanen som bliver fri først
+        if a < fri: #alle landingsbaner er optaget
+            ventetider.append(fri-a)
+            heapq.heapreplace(LB, fri+s)
+        else: #en landingsbane er fri, og det er ligegyldigt hvilken, da de alle er fri før senere fly ankommer
+            heapq.heapreplace(LB, a+s)
+
+    return ventetider, max(LB)
+
+
+def _kø_1LB_array(ankomst, landing, ventetider):
+    #kernen til numba, som skriver ventetiderne i et forhåndsallokeret array og returnerer antallet
+    LB, antal = 0, 0
+
+    for i in range(ankomst.shape[0]):
+        a = np.int64(ankomst[i])
+        if a < LB:
+            ventetider[antal] = LB-a
+            antal += 1
+            LB += landing[i]
+        else:
+            LB = a + landing[i]
+
+    return antal, LB
+
+
+def _kø_k_array(ankomst, landing, k, ventetider):
+    #kernen til numba med k landingsbaner, hvor heapen er et array og roden skiftes ud for hvert fly
+    LB, antal = np.zeros(k, dtype = np.int64), 0
+
+    for i in range(ankomst.shape[0]):
+        a = np.int64(ankomst[i])
+        fri = LB[0]
+        if a < fri:
+            ventetider[antal] = fri-a
+            antal += 1
+            ny = fri + landing[i]
+        else:
+            ny = a + landing[i]
+
+        j = 0 #lader den nye værdi synke ned gennem heapen
+        while 2*j+1 < k:
+            c = 2*j+1
+            if c+1 < k and LB[c+1] < LB[c]:
+                c += 1
+            if LB[c] >= ny:
+                break
+            LB[j] = LB[c]
+            j = c
+        LB[j] = ny
+
+    return antal, LB.max()
+
+
+_numba_kerner = {} #kompileres først når de skal bruges
+
+
+def _numba_kerne(navn):
+    if navn not in _numba_kerner:
+        _numba_kerner[navn] = njit(cache = True)({'1LB': _kø_1LB_array, 'k': _kø_k_array}[navn])
+    return _numba_kerner[navn]
+
+
+def _kø_numba(ankomst, landing, k):
+    ankomst = np.ascontiguousarray(ankomst, dtype = np.int32)
+    landing = np.ascontiguousarray(landing, dtype = np.int32)
+    ventetider = np.empty(len(ankomst), dtype = np.int64)
+
+    if k == 1:
+        antal, LB = _numba_kerne('1LB')(ankomst, landing, ventetider)
+    else:
+        antal, LB = _numba_kerne('k')(ankomst, landing, k, ventetider)
+
+    return ventetider[:antal].tolist(), int(LB)
+
+
+"""
+Anden sektion indeholder valget af backend og de offentlige funktioner.
+"""
+
+
+def vælg_backend(backend=None):
+    """
+    Finder den backend som skal bruges.
+
+    Input
+    backend -> navnet på en backend, 'auto' eller None. None betyder at miljøvariablen LUFTHAVN_BACKEND bruges.
+
+    Output
+    navnet på en af backenderne i BACKENDS.
+
+    Eksempel
+    >>> vælg_backend('python')
+    'python'
+
+    >>> vælg_backend('fortran')
+    Traceback (most recent call last):
+    ...
+    ValueError: ukendt backend 'fortran', vælg en af ('numpy', 'python', 'numba') eller 'auto'
+    """
+
+    if backend is None:
+        backend = os.environ.get('LUFTHAVN_BACKEND', 'auto')
+
+    if backend == 'auto':
+        return 'numba' if njit is not None else 'python'
+    if backend not in BACKENDS:
+        raise ValueError(f'ukendt backend {backend!r}, vælg en af {BACKENDS} eller \'auto\'')
+    if backend == 'numba' and njit is None:
+        raise ImportError('numba backenden kræver at numba er installeret')
+
+    return backend
+
+
+def kø_k(ankomst, landing, k, backend=None):
+    """
+    Kører køen for en dag med k landingsbaner.
+    Et fly lander på en fri landingsbane, og hvis alle er optaget venter det på den som bliver fri først.
+
+    Input
+    ankomst -> sorterede ankomsttider for dagens fly.
+    landing -> landingstider for dagens fly.
+    k -> antallet af landingsbaner.
+    backend -> den backend som skal bruges, se vælg_backend.
+
+    Output
+    ventetider -> en liste med ventetiderne for alle fly, som skal vente med at lande, som int for alle backends.
+    LB -> hvornår det sidste fly er landet på en af landingsbanerne, som int.
+
+    Eksempel
+    >>> kø_k(np.array([10, 20, 30, 40, 100]), np.array([40, 40, 40, 40, 40]), 3, 'python')
+    ([10], 140)
+    >>> kø_k(np.array([10, 20, 30, 40, 100]), np.array([40, 40, 40, 40, 40]), 3, 'numpy')
+    ([10], 140)
+    """
+
+    if k < 1:
+        raise ValueError(f'der skal være mindst en landingsbane, ikke {k}')
+    backend = vælg_backend(backend)
+
+    if backend == 'numba':
+        return _kø_numba(ankomst, landing, k)
+    if backend == 'python':
+        if k == 1: #uden heap er løkken lidt hurtigere
+            return _kø_1LB_python(np.asarray(ankomst), np.asarray(landing))
+        return _kø_k_python(np.asarray(ankomst), np.asarray(landing), k)
+    if k == 1:
+        ventetider, LB = _kø_1LB_numpy(ankomst, landing)
+    elif k == 2:
+        ventetider, LB = _kø_2LB_numpy(ankomst, landing)
+    else:
+        ventetider, LB = _kø_k_numpy(ankomst, landing, k)
+    return [int(v) for v in ventetider], int(LB) #løkkerne over numpy arrays giver numpy heltal
+
+
+def kø_1LB(ankomst, landing, backend=None):
+    """
+    Kører køen for en dag med en landingsbane, se kø_k.
+
+    Eksempel
+    >>> kø_1LB(np.array([10, 20, 100]), np.array([40, 40, 40]), 'python')
+    ([30], 140)
+    """
+
+    return kø_k(ankomst, landing, 1, backend)
+
+
+def kø_2LB(ankomst, landing, backend=None):
+    """
+    Kører køen for en dag med to landingsbaner, se kø_k.
+
+    Eksempel
+    >>> kø_2LB(np.array([10, 20, 30, 100]), np.array([40, 40, 40, 40]), 'python')
+    ([20], 140)
+    """
+
+    return kø_k(ankomst, landing, 2, backend)
+
+
+"""
+Tredje sektion indeholder et mikro-benchmark af backenderne.
+"""
+
+
+def benchmark(n=200, dage=200, seed=1):
+    """
+    Måler hvor lang tid hver backend bruger på de samme dage, og hvor meget hurtigere den er end numpy backenden.
+    Det tjekkes samtidig at alle backends giver de samme resultater.
+
+    Input
+    n -> den gennemsnitlige mængde fly per dag.
+    dage -> antallet af dage som køres for hver backend.
+    seed -> seed til at danne flyene.
+
+    Output
+    resultater -> en liste med (kø, backend, sekunder, speedup) for hver kø og backend.
+    """
+
+    import Lufthavns_simulation_module as lsm
+
+    state = np.random.get_state() #flyene dannes uden at flytte den globale tilstand
+    np.random.seed(seed)
+    fly_liste = [lsm.fly(n) for i in range(dage)]
+    np.random.set_state(state)
+
+    backends = [b for b in BACKENDS if b != 'numba' or njit is not None]
+    resultater = []
+
+    for k in (1, 2, 4):
+        navn = f'{k}LB'
+        if 'numba' in backends: #kompilering tælles ikke med i tiden
+            kø_k(fly_liste[0][:,0], fly_liste[0][:,1], k, 'numba')
+
+        tider, svar = {}, {}
+        for backend in backends:
+            t = time.perf_counter()
+            svar[backend] = [kø_k(f[:,0], f[:,1], k, backend) for f in fly_liste]
+            tider[backend] = time.perf_counter() - t
+
+        for backend in backends:
+            if svar[backend] != svar['numpy']:
+                raise AssertionError(f'{backend} backenden giver andre resultater end numpy for {navn}')
+            resultater.append((navn, backend, tider[backend], tider['numpy']/tider[backend]))
+
+    return resultater
+
+
+
+if  __name__ == '__main__':
+   import doctest
+   print(doctest.testmod())
+
+   for navn, backend, tid, speedup in benchmark():
+       print(f'{navn} {backend:>6}: {tid:8.4f} s  {speedup:7.1f}x')
@@ -0,0 +1,257 @@
+"""
+@author: Mikkel Hviid Thorn og Rebekka Engelund Balle
+
+
+Information
+Modulet indeholder en benchmark af simuleringen, som kan gemmes og sammenlignes med en tidligere kørsel.
+Hver benchmark kører en funktion fra Lufthavns_simulation_module for en række størrelser og måler
+- tiden, som er den korteste af flere gentagelser, eller en enkelt kørsel for store størrelser,
+- fly per sekund, ud fra det forventede antal fly som simuleres,
+- den største mængde hukommelse brugt undervejs, målt med tracemalloc i en separat kørsel.
+
+Alle kørsler bruger en numpy.random.Generator, så den globale tilstand i numpy.random ikke flyttes.
+Resultaterne gemmes som JSON. Ved sammenligning med en tidligere fil er der en regression, hvis fly per sekund
+er faldet mere end tærsklen, og så afslutter kommandolinjen med exit kode 1.
+
+Kommandolinje
+python Lufthavns_benchmark_module.py --gem ny.json --sammenlign gammel.json --tærskel 0.1
+Med --fuld køres hele gitteret fra 50 til 10.000 fly om dagen og 1 til 10.000 dage.
+
+
+Ordbog
+- størrelse er (n, dage), hvor n er den gennemsnitlige mængde fly per dag, og dage er antallet af simulerede dage.
+- For l_år benchmarks er dage antallet af dage hvert år, og der simuleres ÅR+1 år med væksten VÆKST.
+"""
+
+
+import sys
+import json
+import time
+import platform
+import tracemalloc
+import numpy as np
+import Lufthavns_backend_module as lbm
+import Lufthavns_simulation_module as lsm
+
+
+N = (50, 200, 1000, 10000)
+DAGE = (1, 10, 100, 1000, 10000)
+ÅR = 2
+VÆKST = 1.05 #væksten i l_år benchmarkene, som både gives til funktionerne og bruges til antallet af fly
+MAX_FLY = {'hurtig': 2*10**5, 'fuld': 10**8} #størrelser med flere fly end dette springes over
+LANG_TID = 1.0 #en kørsel som tager mere end dette antal sekunder gentages ikke
+
+
+"""
+Første sektion indeholder benchmarkene.
+Hver benchmark er en funktion af n, dage og rng, og antallet af fly som den forventes at simulere.
+"""
+
+
+def _år_fly(n, dage):
+    #det forventede antal fly over ÅR+1 år med væksten VÆKST, samme udregning som i l_år
+    return dage*sum(int(n*VÆKST**i) for i in range(ÅR+1))
+
+
+def _dag_for_dag(dag):
+    #kører dag(n, rng) for hver dag uden at gemme resultaterne, så hukommelsen ikke vokser med antallet af dage
+    def funktion(n, dage, rng):
+        for d in range(dage):
+            dag(n, rng)
+    return funktion
+
+
+BENCHMARKS = {
+    'fly': (_dag_for_dag(lambda n, rng: lsm.fly(n, rng)), lambda n, dage: n*dage),
+    'en_dag': (_dag_for_dag(lambda n, rng: lsm.en_dag(n, rng = rng)), lambda n, dage: n*dage),
+    'en_dag_2LB': (_dag_for_dag(lambda n, rng: lsm.en_dag_2LB(n, rng = rng)), lambda n, dage: n*dage),
+    'm_dage': (lambda n, dage, rng: lsm.m_dage(dage, n, rng = rng), lambda n, dage: n*dage),
+    'm_dage_2LB': (lambda n, dage, rng: lsm.m_dage_2LB(dage, n, rng = rng), lambda n, dage: n*dage),
+    'm_dage_batch': (lambda n, dage, rng: lsm.m_dage_batch(dage, n, rng = rng), lambda n, dage: n*dage),
+    'm_dage_strøm': (lambda n, dage, rng: lsm.m_dage_strøm(dage, n, rng = rng), lambda n, dage: n*dage),
+    'l_år': (lambda n, dage, rng: lsm.l_år(ÅR, dage, n, rng = rng, vækst = VÆKST), _år_fly),
+    'l_år_2LB': (lambda n, dage, rng: lsm.l_år_2LB(ÅR, dage, n, rng = rng, vækst = VÆKST), _år_fly),
+    'l_år_batch': (lambda n, dage, rng: lsm.l_år_batch(ÅR, dage, n, rng = rng, vækst = VÆKST), _år_fly),
+}
+
+
+def størrelser(fuld=False):
+    """
+    Gitteret af størrelser som benchmarkene køres for.
+
+    Input
+    fuld -> med False springes størrelser med mere end MAX_FLY['hurtig'] fly over, ellers MAX_FLY['fuld'].
+
+    Output
+    en liste med (n, dage).
+
+    Eksempel
+    >>> størrelser()[:3]
+    [(50, 1), (50, 10), (50, 100)]
+    """
+
+    max_fly = MAX_FLY['fuld' if fuld else 'hurtig']
+    return [(n, dage) for n in N for dage in DAGE if n*dage <= max_fly]
+
+
+"""
+Anden sektion indeholder målingerne.
+"""
+
+
+def mål(navn, n, dage, gentagelser=3, seed=1, min_tid=0.05, lang_tid=LANG_TID):
+    """
+    Måler en benchmark for en størrelse.
+
+    Input
+    navn -> navnet på benchmarken i BENCHMARKS.
+    n, dage -> størrelsen.
+    gentagelser -> antallet af gentagelser, hvor den hurtigste tæller.
+    seed -> seed til numpy.random.default_rng, som er det samme i hver kørsel.
+    min_tid -> den mindste tid i sekunder for en gentagelse. Hurtige benchmarks køres flere gange i hver gentagelse,
+    så målingen ikke drukner i støj.
+    lang_tid -> hvis den første kørsel tager mere end lang_tid sekunder, er den målingen, og der gentages ikke.
+
+    Output
+    en dictionary med navn, n, dage, fly, sekunder, fly_per_sekund og peak_bytes.
+
+    Eksempel
+    >>> r = mål('en_dag', 50, 2, gentagelser = 1)
+    >>> r['navn'], r['fly'], r['peak_bytes'] > 0
+    ('en_dag', 100, True)
+    """
+
+    funktion, antal_fly = BENCHMARKS[navn]
+    funktion(n, 1, np.random.default_rng(seed)) #opvarmning, så fx kompilering med numba ikke tælles med
+
+    t = time.perf_counter()
+    funktion(n, dage, np.random.default_rng(seed))
+    tider = [time.perf_counter() - t]
+    gange = max(1, int(np.ceil(min_tid/max(tider[0], 1e-9)))) #kørsler per gentagelse
+
+    if tider[0] <= lang_tid: #store størrelser gentages ikke, så --fuld kan køres på rimelig tid
+        tider = []
+        for g in range(gentagelser):
+            rng = [np.random.default_rng(seed) for i in range(gange)]
+            t = time.perf_counter()
+            for i in range(gange):
+                funktion(n, dage, rng[i])
+            tider.append((time.perf_counter() - t)/gange)
+
+    tracemalloc.start() #tracemalloc gør kørslen langsommere, så hukommelsen måles for sig
+    try:
+        funktion(n, dage, np.random.default_rng(seed))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    fly = antal_fly(n, dage)
+    sekunder = min(tider)
+    return {'navn': navn, 'n': n, 'dage': dage, 'fly': fly, 'sekunder': sekunder,
+            'fly_per_sekund': fly/sekunder if sekunder > 0 else float('inf'), 'peak_bytes': peak}
+
+
+def kør(navne=None, fuld=False, gentagelser=3, seed=1, udskriv=False):
+    """
+    Kører benchmarkene for alle størrelser.
+
+    Input
+    navne -> navnene på de benchmarks som køres. None betyder alle i BENCHMARKS.
+    fuld -> som i størrelser.
+    gentagelser, seed -> som i mål.
+    udskriv -> om hver måling skrives ud, når den er færdig.
+
+    Output
+    en dictionary med information om maskinen under 'meta' og en liste med målingerne fra mål under 'resultater'.
+    """
+
+    meta = {'tidspunkt': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+            'numpy': np.__version__, 'platform': platform.platform(), 'backend': lbm.vælg_backend(),
+            'gentagelser': gentagelser, 'seed': seed, 'år': ÅR, 'vækst': VÆKST}
+    resultater = []
+
+    for navn in navne or BENCHMARKS:
+        for n, dage in størrelser(fuld):
+            resultat = mål(navn, n, dage, gentagelser, seed)
+            resultater.append(resultat)
+            if udskriv:
+                print(f"{navn:>14} n={n:<6} dage={dage:<6} {resultat['sekunder']:9.4f} s "
+                      f"{resultat['fly_per_sekund']:12.0f} fly/s {resultat['peak_bytes']/1024**2:9.2f} MB")
+
+    return {'meta': meta, 'resultater': resultater}
+
+
+def gem(resultat, sti):
+    #gemmer et resultat fra kør som JSON
+    with open(sti, 'w', encoding = 'utf-8') as fil:
+        json.dump(resultat, fil, indent = 2, ensure_ascii = False)
+
+
+def indlæs(sti):
+    #indlæser et resultat gemt med gem
+    with open(sti, encoding = 'utf-8') as fil:
+        return json.load(fil)
+
+
+def sammenlign(ny, gammel, tærskel=0.1):
+    """
+    Finder de målinger, hvor fly per sekund er faldet mere end tærsklen i forhold til en tidligere kørsel.
+    Målinger som kun findes i den ene kørsel springes over.
+
+    Input
+    ny, gammel -> resultater fra kør eller indlæs.
+    tærskel -> det største tilladte relative fald i fly per sekund.
+
+    Output
+    regressioner -> en liste med (navn, n, dage, gammel fly_per_sekund, ny fly_per_sekund, relativt fald).
+
+    Eksempel
+    >>> gammel = {'resultater': [{'navn': 'fly', 'n': 50, 'dage': 1, 'fly_per_sekund': 1000.0}]}
+    >>> ny = {'resultater': [{'navn': 'fly', 'n': 50, 'dage': 1, 'fly_per_sekund': 800.0}]}
+    >>> sammenlign(ny, gammel, 0.1)
+    [('fly', 50, 1, 1000.0, 800.0, 0.2)]
+    >>> sammenlign(ny, gammel, 0.25)
+    []
+    """
+
+    gamle = {(r['navn'], r['n'], r['dage']): r['fly_per_sekund'] for r in gammel['resultater']}
+    regressioner = []
+
+    for r in ny['resultater']:
+        nøgle = (r['navn'], r['n'], r['dage'])
+        if nøgle not in gamle:
+            continue
+        fald = 1 - r['fly_per_sekund']/gamle[nøgle]
+        if fald > tærskel:
+            regressioner.append((*nøgle, gamle[nøgle], r['fly_per_sekund'], round(fald, 10)))
+
+    return regressioner
+
+
+
+if  __name__ == '__main__':
+   import argparse
+
+   parser = argparse.ArgumentParser(description = 'Benchmark af simuleringen af lufthavnen.')
+   parser.add_argument('navne', nargs = '*', help = f'benchmarks som køres, standard er alle: {", ".join(BENCHMARKS)}')
+   parser.add_argument('--fuld', action = 'store_true', help = 'kører hele gitteret af størrelser')
+   parser.add_argument('--gentagelser', type = int, default = 3, help = 'antal gentagelser af hver måling')
+   parser.add_argument('--seed', type = int, default = 1)
+   parser.add_argument('--gem', metavar = 'FIL', help = 'gemmer resultaterne som JSON')
+   parser.add_argument('--sammenlign', metavar = 'FIL', help = 'sammenligner med resultaterne i en JSON fil')
+   parser.add_argument('--tærskel', type = float, default = 0.1, help = 'største tilladte fald i fly per sekund, standard 0.1')
+   args = parser.parse_args()
+
+   ukendte = [navn for navn in args.navne if navn not in BENCHMARKS]
+   if ukendte:
+       parser.error(f'ukendte benchmarks: {", ".join(ukendte)}')
+
+   resultat = kør(args.navne or None, args.fuld, args.gentagelser, args.seed, udskriv = True)
+   if args.gem:
+       gem(resultat, args.gem)
+
+   if args.sammenlign:
+       regressioner = sammenlign(resultat, indlæs(args.sammenlign), args.tærskel)
+       for navn, n, dage, før, efter, fald in regressioner:
+           print(f'REGRESSION {navn} n={n} dage={dage}: {før:.0f} -> {efter:.0f} fly/s ({fald:.1%} langsommere)')
+       sys.exit(1 if regressioner else 0)
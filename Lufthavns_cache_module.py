@@ -0,0 +1,255 @@
+"""
+@author: Mikkel Hviid Thorn og Rebekka Engelund Balle
+
+
+Information
+Modulet gemmer resultaterne af simuleringerne på disken, så de ikke skal simuleres igen.
+Et resultat findes ud fra en nøgle, som er en hash af
+- funktionens navn og argumenter,
+- seed til numpy.random.Generator,
+- kildekoden til funktionens modul og alle de lokale Lufthavns_ moduler, som det importerer direkte eller gennem andre
+  lokale moduler, så ændringer i koden giver nye resultater.
+
+Resultaterne gemmes som komprimerede .npz filer i mappen fra miljøvariablen LUFTHAVN_CACHE,
+eller i .lufthavn_cache ved siden af modulet. Når mappen fylder mere end max_bytes, slettes de filer
+som er brugt for længst tid siden. Hver gang en fil bruges, opdateres dens tidsstempel.
+
+Resultater som genkendes:
+- tupler af lister eller arrays, fx fra m_dage, m_dage_2LB, l_år og l_år_2LB.
+- objekter med metoderne til_arrays og fra_arrays.
+"""
+
+
+import os
+import sys
+import ast
+import json
+import glob
+import inspect
+import hashlib
+import tempfile
+import importlib.util
+import numpy as np
+import Lufthavns_simulation_module as lsm
+
+
+MAPPE = os.environ.get('LUFTHAVN_CACHE', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.lufthavn_cache'))
+MAX_BYTES = 2*1024**3
+LOKALE = 'Lufthavns_' #moduler med dette navn er en del af simuleringen og tæller med i kode_hash
+
+
+"""
+Første sektion indeholder nøglerne og selve filerne.
+"""
+
+
+def lokale_filer(funktion):
+    """
+    Filerne med funktionens modul og alle de lokale moduler, som det importerer direkte eller gennem andre lokale moduler.
+    Importerne findes i kildekoden, så også importer inde i funktioner tæller med.
+
+    Eksempel
+    >>> import Lufthavns_resultat_module as lr
+    >>> sorted(os.path.basename(sti) for sti in lokale_filer(lr.l_år_resultat))
+    ['Lufthavns_backend_module.py', 'Lufthavns_parallel_module.py', 'Lufthavns_profil_module.py', 'Lufthavns_resultat_module.py', 'Lufthavns_simulation_module.py', 'Lufthavns_statistik_module.py']
+    """
+
+    filer, mangler = set(), [os.path.abspath(sys.modules[funktion.__module__].__file__)]
+    while mangler:
+        sti = mangler.pop()
+        if sti in filer:
+            continue
+        filer.add(sti)
+        with open(sti, 'rb') as fil:
+            træ = ast.parse(fil.read())
+        for node in ast.walk(træ):
+            if isinstance(node, ast.Import):
+                navne = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                navne = [node.module]
+            else:
+                continue
+            for navn in navne:
+                spec = importlib.util.find_spec(navn) if navn.startswith(LOKALE) else None
+                if spec is not None and spec.origin:
+                    mangler.append(os.path.abspath(spec.origin))
+    return filer
+
+
+def kode_hash(funktion):
+    """
+    En hash af kildekoden til funktionens modul og alle de lokale moduler, som den bygger på, se lokale_filer.
+    """
+
+    h = hashlib.sha256()
+    for sti in sorted(lokale_filer(funktion)):
+        with open(sti, 'rb') as fil:
+            h.update(fil.read())
+    return h.hexdigest()
+
+
+def _stabil(x):
+    #x som tal, tekst, None og lister, så json giver den samme tekst hver gang. Objekter gemmes med deres type og felter,
+    #og funktioner og andre objekter uden felter afvises, fordi deres repr fx indeholder en adresse i hukommelsen
+    if x is None or isinstance(x, (bool, int, float, str)):
+        return x
+    if isinstance(x, np.generic):
+        return x.item()
+    if isinstance(x, np.ndarray):
+        return {'dtype': x.dtype.str, 'shape': list(x.shape), 'værdier': _stabil(x.tolist())}
+    if isinstance(x, (list, tuple)):
+        return [_stabil(y) for y in x]
+    if isinstance(x, dict):
+        return sorted([json.dumps(_stabil(a)), _stabil(b)] for a, b in x.items())
+    if not callable(x) and hasattr(x, '__dict__'):
+        return {'type': f'{type(x).__module__}.{type(x).__qualname__}', 'felter': _stabil(vars(x))}
+    raise TypeError(f'argumenter af typen {type(x).__name__} kan ikke indgå i nøglen til cachen')
+
+
+def nøgle(funktion, args, kwargs, seed):
+    """
+    Nøglen til et resultat, som er en hash af funktionen, argumenterne, seed og kildekoden.
+    Argumenterne skal være tal, tekst, None, arrays, lister, tupler og dictionaries af dem eller objekter med sådanne felter.
+
+    Eksempel
+    >>> len(nøgle(lsm.m_dage, (3, 50), {}, 1))
+    64
+    >>> nøgle(lsm.m_dage, (3, np.int64(50)), {}, 1) == nøgle(lsm.m_dage, (3, 50), {}, 1)
+    True
+    >>> nøgle(lsm.m_dage, (3, 50), {'rng': np.random.default_rng(1)}, 1)
+    Traceback (most recent call last):
+    ...
+    TypeError: argumenter af typen Generator kan ikke indgå i nøglen til cachen
+    """
+
+    beskrivelse = json.dumps([funktion.__module__, funktion.__qualname__, _stabil(args), _stabil(kwargs), _stabil(seed), kode_hash(funktion)])
+    return hashlib.sha256(beskrivelse.encode()).hexdigest()
+
+
+def _til_arrays(resultat):
+    #omdanner et resultat til en dictionary med arrays, som kan gemmes i en .npz fil
+    if hasattr(resultat, 'til_arrays'):
+        arrays = resultat.til_arrays()
+        arrays['_type'] = np.array(f'{type(resultat).__module__}.{type(resultat).__qualname__}')
+        return arrays
+    arrays = {f'del_{i}': np.asarray(del_resultat) for i, del_resultat in enumerate(resultat)}
+    arrays['_type'] = np.array('tuple')
+    return arrays
+
+
+def _fra_arrays(arrays):
+    #omdanner arrays fra en .npz fil tilbage til det oprindelige resultat
+    type_navn = str(arrays.pop('_type'))
+    if type_navn == 'tuple':
+        return tuple(arrays[f'del_{i}'].tolist() for i in range(len(arrays)))
+    modul, navn = type_navn.rsplit('.', 1)
+    return getattr(sys.modules.get(modul) or __import__(modul), navn).fra_arrays(arrays)
+
+
+def ryd_op(mappe=None, max_bytes=MAX_BYTES):
+    """
+    Sletter de filer i cachen, som er brugt for længst tid siden, indtil cachen fylder højst max_bytes.
+    """
+
+    filer = sorted(glob.glob(os.path.join(mappe or MAPPE, '*.npz')), key = os.path.getmtime)
+    størrelser = [os.path.getsize(fil) for fil in filer]
+    total = sum(størrelser)
+    for fil, størrelse in zip(filer, størrelser): #de ældste filer først
+        if total <= max_bytes:
+            break
+        os.remove(fil)
+        total -= størrelse
+
+
+"""
+Anden sektion indeholder funktionerne som bruger cachen.
+"""
+
+
+def cached(funktion, *args, seed=1, brug_cache=True, mappe=None, max_bytes=MAX_BYTES, **kwargs):
+    """
+    Kører funktion(*args, **kwargs) med en generator fra seed, eller henter resultatet fra cachen.
+    Funktionen skal tage enten et rng eller et seed argument.
+
+    Input
+    funktion -> simuleringen, fx Lufthavns_simulation_module.l_år.
+    args, kwargs -> argumenterne til funktionen.
+    seed -> seed til numpy.random.default_rng, eller til funktionens seed argument.
+    brug_cache -> med False køres funktionen altid, og resultatet gemmes ikke.
+    mappe -> mappen med cachen. None betyder MAPPE.
+    max_bytes -> det største antal bytes cachen må fylde.
+
+    Output
+    resultatet af funktionen i samme form, som når det hentes fra cachen. Tupler har lister med tal fra Python.
+
+    Eksempel
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as mappe:
+    ...     svar = [cached(lsm.m_dage, 2, 200, mappe = mappe) for i in range(2)] #først simuleres, så hentes fra cachen
+    >>> svar[0] == svar[1], type(svar[0][2][0]) is type(svar[1][2][0]) is int
+    (True, True)
+    """
+
+    if 'seed' in inspect.signature(funktion).parameters: #funktionen danner selv sine generatorer fra seed
+        kør = lambda: funktion(*args, seed = seed, **kwargs)
+    else:
+        kør = lambda: funktion(*args, rng = np.random.default_rng(seed), **kwargs)
+
+    if not brug_cache:
+        return _fra_arrays(_til_arrays(kør())) #samme typer som fra cachen
+
+    mappe = mappe or MAPPE
+    sti = os.path.join(mappe, nøgle(funktion, args, kwargs, seed) + '.npz')
+
+    if os.path.exists(sti):
+        os.utime(sti) #markerer filen som brugt
+        with np.load(sti) as fil:
+            return _fra_arrays(dict(fil))
+
+    arrays = _til_arrays(kør())
+
+    os.makedirs(mappe, exist_ok = True)
+    fd, midlertidig = tempfile.mkstemp(suffix = '.tmp', dir = mappe) #skriver først til en midlertidig fil, så en halv fil aldrig bliver læst
+    with os.fdopen(fd, 'wb') as fil:
+        np.savez_compressed(fil, **arrays)
+    os.replace(midlertidig, sti)
+    ryd_op(mappe, max_bytes)
+
+    return _fra_arrays(arrays) #samme typer som når resultatet hentes fra cachen
+
+
+def m_dage(m,n,seed=1,brug_cache=True,**kwargs):
+    #m_dage fra Lufthavns_simulation_module gennem cachen
+    return cached(lsm.m_dage, m, n, seed = seed, brug_cache = brug_cache, **kwargs)
+
+
+def m_dage_2LB(m,n,seed=1,brug_cache=True,**kwargs):
+    #m_dage_2LB fra Lufthavns_simulation_module gennem cachen
+    return cached(lsm.m_dage_2LB, m, n, seed = seed, brug_cache = brug_cache, **kwargs)
+
+
+def l_år(l,m,n,seed=1,brug_cache=True,**kwargs):
+    #l_år fra Lufthavns_simulation_module gennem cachen
+    return cached(lsm.l_år, l, m, n, seed = seed, brug_cache = brug_cache, **kwargs)
+
+
+def l_år_2LB(l,m,n,seed=1,brug_cache=True,**kwargs):
+    #l_år_2LB fra Lufthavns_simulation_module gennem cachen
+    return cached(lsm.l_år_2LB, l, m, n, seed = seed, brug_cache = brug_cache, **kwargs)
+
+
+
+if  __name__ == '__main__':
+   import argparse
+
+   parser = argparse.ArgumentParser(description = 'Viser eller rydder cachen med simuleringer.')
+   parser.add_argument('--ryd', action = 'store_true', help = 'sletter alle filer i cachen')
+   args = parser.parse_args()
+
+   filer = glob.glob(os.path.join(MAPPE, '*.npz'))
+   if args.ryd:
+       for fil in filer:
+           os.remove(fil)
+       print(f'slettede {len(filer)} filer fra {MAPPE}')
+   else:
+       print(f'{len(filer)} filer, {sum(map(os.path.getsize, filer))/1024**2:.1f} MB i {MAPPE}')
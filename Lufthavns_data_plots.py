@@ -9,169 +9,257 @@ Ordbog
 - ventetider er tiden et fly skal vente før det kan lande, hvor tiden kun tælles, hvis den er forskelligt for nul.
 - fly_der_venter er brøkdelen af fly som venter.
 - over_lukketid er den tid, hvor sidste fly er landet, relativt til de 13 timer.
-
-Vær opmærksom på at koden gemmer seks figurer når den køres!
+- halen er kvantilerne af ventetiderne over alle fly i et år, fx p95 og p99, og den største ventetid.
+
+Scriptet er delt i to trin, så en ændring i en figur ikke kører simuleringen igen:
+- simuler -> simulerer lufthavnen med en og to landingsbaner og gemmer resultaterne som Resultat i mappen resultater.
+  Simuleringerne hentes fra cachen i Lufthavns_cache_module, hvis de findes. Kør med --no-cache for at simulere forfra.
+- plot -> indlæser resultaterne og tegner figurerne i flere processer med Agg backenden.
+  Figurerne kan vælges med --figurer, og formatet og opløsningen med --format og --dpi.
+Uden et trin simuleres der, hvis resultaterne ikke findes eller er simuleret med andre parametre, og derefter tegnes alle figurer.
+Parametrene --år, --dage, --n og --seed gemmes i parametre.json ved siden af resultaterne. plot bruger de gemte parametre,
+og stopper med en fejl, hvis de parametre som gives ikke passer med dem, så der aldrig tegnes figurer af forkerte data.
+
+Eksempler
+python Lufthavns_data_plots.py
+python Lufthavns_data_plots.py simuler --år 12 --no-cache
+python Lufthavns_data_plots.py plot --figurer gns_ventetider hist_lukketider --format png pdf --dpi 150
 """
 
 
-import Lufthavns_simulation_module as lsm
-import matplotlib.pyplot as plt
+import os
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+import matplotlib
+matplotlib.use('Agg') #figurerne gemmes kun som filer, så der skal ikke bruges et vindue
+import matplotlib.pyplot as plt
+import Lufthavns_resultat_module as lr
 
 
-"""
-Data, som skal plottes kommer fra simulationen i Lufthavns_simulation_module
-"""
-
-
-år = 12 #antal år 
-
-#gemmer data fra simuleringer med en landingsbane
-ventetider, fly_der_venter, over_lukketid = lsm.l_år(år,300,200)
-
-#gemmer data fra simuleringer med to landingsbaner
-ventetider2, fly_der_venter2, over_lukketid2 = lsm.l_år_2LB(år,300,200)
+MAPPE = 'resultater'
+BANER = {1: '1LB', 2: '2LB'} #undermapperne med resultaterne for hvert antal landingsbaner
+PARAMETRE = 'parametre.json' #filen med parametrene som resultaterne er simuleret med
+STANDARD = {'år': 12, 'dage': 300, 'n': 200, 'seed': 1}
+START_ÅR = 2020
 
 
 """
-Plot udseende
+Første sektion indeholder simuleringen, som gemmer resultaterne.
 """
 
 
-plt.style.use('seaborn')
+def simuler(år=12, dage=300, n=200, seed=1, mappe=MAPPE, brug_cache=True):
+    #simulerer på alle processorkerner, opgaverne har hver sin generator fra seed, og resultaterne hentes fra cachen hvis de findes
+    import Lufthavns_cache_module as lcm
 
-plt.rc('font', size=20)          # controls default text sizes
-plt.rc('axes', titlesize=20)     # fontsize of the axes title
-plt.rc('axes', labelsize=20)     # fontsize of the x and y labels
-plt.rc('xtick', labelsize=12)    # fontsize of the tick labels
-plt.rc('ytick', labelsize=12)    # fontsize of the tick labels
-plt.rc('legend', fontsize=15)    # legend fontsize
-plt.rc('figure', titlesize=25)   # fontsize of the figure title
+    for k, navn in BANER.items(): #resultaterne er arrays med formen (år, dage)
+        resultat = lcm.cached(lr.l_år_resultat,år,dage,n,k,seed=seed,brug_cache=brug_cache)
+        resultat.gem(os.path.join(mappe, navn))
 
+    with open(os.path.join(mappe, PARAMETRE), 'w', encoding = 'utf-8') as fil: #skrives til sidst, så de kun findes når resultaterne gør
+        json.dump({'år': år, 'dage': dage, 'n': n, 'seed': seed}, fil)
 
-"""
-Danner et plot over gennemsnitlige ventetider over et antal år.
-"""
 
+def gemte_parametre(mappe=MAPPE):
+    #parametrene som resultaterne i mappen er simuleret med, eller None hvis resultaterne eller parametrene mangler
+    sti = os.path.join(mappe, PARAMETRE)
+    if not os.path.exists(sti) or not all(os.path.exists(os.path.join(mappe, navn, 'start.npy')) for navn in BANER.values()):
+        return None
+    with open(sti, encoding = 'utf-8') as fil:
+        return json.load(fil)
 
-plt.figure()
-plt.plot(np.arange(år+1)+np.repeat(2020,år+1), np.mean(ventetider, axis=1), 'o-', color='firebrick', label='En landingsbane')
-plt.plot(np.arange(år+1)+np.repeat(2020,år+1), np.mean(ventetider2, axis=1), 'o-', color='navy', label='To landingsbaner')
-plt.xticks(np.linspace(2020, 2020+år, int(år/2+1)))
-plt.title('Gennemsnitlig ventetid over 12 år'); plt.legend(loc = 'upper left')
-plt.xlabel('Årstal'); plt.ylabel('Ventetid i sekunder')
 
-plt.savefig('gns_ventetider.png', dpi = 500, bbox_inches = 'tight')
+def indlæs(mappe=MAPPE):
+    #indlæser resultaterne som memory-mappede arrays, så kun de dele som plottes læses
+    return {k: lr.Resultat.indlæs(os.path.join(mappe, navn)) for k, navn in BANER.items()}
 
 
 """
-Danner et plot over gennemsnitlige antal fly der venter over et antal år.
+Anden sektion indeholder figurerne. Hver figur er en funktion af resultaterne, som giver figuren.
 """
 
 
-plt.figure()
-plt.plot(np.arange(år+1)+np.repeat(2020,år+1), np.mean(fly_der_venter, axis=1), 'o-', color='firebrick', label='En landingsbane')
-plt.plot(np.arange(år+1)+np.repeat(2020,år+1), np.mean(fly_der_venter2, axis=1), 'o-', color='navy', label='To landingsbaner')
-plt.xticks(np.linspace(2020, 2020+år, int(år/2+1)))
-plt.title('Andel fly som venter med at lande over 12 år'); plt.legend(loc = 'upper left')
-plt.xlabel('Årstal'); plt.ylabel('Andel fly som venter')
-
-plt.savefig('gns_andel_fly_der_venter.png', dpi = 500, bbox_inches = 'tight')
+def _stil():
+    #seaborn stilen hedder seaborn-v0_8 i nyere matplotlib
+    for stil in ('seaborn-v0_8', 'seaborn'):
+        if stil in plt.style.available:
+            plt.style.use(stil)
+            break
 
-
-"""
-Danner et plot over gennemsnitlige lukketid over et antal år.
-"""
+    plt.rc('font', size=20)          # controls default text sizes
+    plt.rc('axes', titlesize=20)     # fontsize of the axes title
+    plt.rc('axes', labelsize=20)     # fontsize of the x and y labels
+    plt.rc('xtick', labelsize=12)    # fontsize of the tick labels
+    plt.rc('ytick', labelsize=12)    # fontsize of the tick labels
+    plt.rc('legend', fontsize=15)    # legend fontsize
+    plt.rc('figure', titlesize=25)   # fontsize of the figure title
 
 
-plt.figure()
-plt.plot(np.arange(år+1)+np.repeat(2020,år+1), np.mean(over_lukketid, axis=1), 'o-', color='firebrick', label='En landingsbane')
-plt.plot(np.arange(år+1)+np.repeat(2020,år+1), np.mean(over_lukketid2, axis=1), 'o-', color='navy', label='To landingsbaner')
-plt.xticks(np.linspace(2020, 2020+år, int(år/2+1)))
-plt.title('Relativ lukketid over 12 år'); plt.legend(loc = 'upper left')
-plt.xlabel('Årstal'); plt.ylabel('Lukketid i sekunder')
+def _årstal(resultater):
+    år = resultater[1].shape[0] - 1
+    return år, np.arange(år+1) + START_ÅR
 
-plt.savefig('gns_lukketid.png', dpi = 500, bbox_inches = 'tight')
 
-
-"""
-Histogram over fordelingen af de daglige gennemsnitlige ventetider for en landingsbane.
-"""
+def _gns_plot(resultater, gns, titel, ylabel):
+    #et plot over de gennemsnitlige værdier for hvert år med en og to landingsbaner
+    år, årstal = _årstal(resultater)
+    fig = plt.figure()
+    plt.plot(årstal, gns(resultater[1]), 'o-', color='firebrick', label='En landingsbane')
+    plt.plot(årstal, gns(resultater[2]), 'o-', color='navy', label='To landingsbaner')
+    plt.xticks(np.linspace(START_ÅR, START_ÅR+år, int(år/2+1)))
+    plt.title(f'{titel} over {år} år'); plt.legend(loc = 'upper left')
+    plt.xlabel('Årstal'); plt.ylabel(ylabel)
+    return fig
 
 
-fig, axs = plt.subplots(2, 2)
-fig.suptitle('Fordelingen af ventetider med en landingsbane')
+def gns_ventetider(resultater):
+    #gennemsnitlige ventetider over et antal år, hvor dage uden ventende fly ikke tæller med
+    return _gns_plot(resultater, lambda r: r.gns('ventetider'), 'Gennemsnitlig ventetid', 'Ventetid i sekunder')
 
-(ax1, ax2), (ax3, ax4) = axs
-ax1.hist(ventetider[0], bins=20, density=True, color='firebrick', label='2020')
-ax1.legend(loc = 'upper right')
 
-ax2.hist(ventetider[3], bins=20, density=True, color='navy', label='2023')
-ax2.legend(loc = 'upper right')
+def gns_andel_fly_der_venter(resultater):
+    #gennemsnitlige antal fly der venter over et antal år
+    return _gns_plot(resultater, lambda r: r.gns('fly_der_venter'), 'Andel fly som venter med at lande', 'Andel fly som venter')
 
-ax3.hist(ventetider[6], bins=20, density=True, color='forestgreen', label='2026')
-ax3.legend(loc = 'upper right')
 
-ax4.hist(ventetider[9], bins=20, density=True, color='darkorange', label='2029')
-ax4.legend(loc = 'upper right')
+def gns_lukketid(resultater):
+    #gennemsnitlige lukketid over et antal år
+    return _gns_plot(resultater, lambda r: r.gns('over_lukketid'), 'Relativ lukketid', 'Lukketid i sekunder')
 
-fig.text(0.5, 0.02, 'Ventetid i sekunder', ha='center')
-fig.text(0.02, 0.5, 'Tæthed', va='center', rotation='vertical')
 
-plt.savefig('hist_ventetider_1LB.png', dpi = 500, bbox_inches = 'tight')
+def _hist_ventetider(resultat, titel):
+    #histogram over fordelingen af de daglige gennemsnitlige ventetider i fire af årene
+    år = resultat.shape[0] - 1
+    fig, axs = plt.subplots(2, 2)
+    fig.suptitle(titel)
 
+    for ax, i, farve in zip(axs.ravel(), (0, 3, 6, 9), ('firebrick', 'navy', 'forestgreen', 'darkorange')):
+        i = min(i, år)
+        ax.hist(resultat.ikke_tomme(i), bins=20, density=True, color=farve, label=str(START_ÅR+i))
+        ax.legend(loc = 'upper right')
 
-"""
-Histogram over fordelingen af de daglige gennemsnitlige ventetider for to landingsbaner.
-"""
+    fig.text(0.5, 0.02, 'Ventetid i sekunder', ha='center')
+    fig.text(0.02, 0.5, 'Tæthed', va='center', rotation='vertical')
+    return fig
 
 
-fig, axs = plt.subplots(2, 2)
-fig.suptitle('Fordelingen af ventetider med to landingsbaner')
+def hist_ventetider_1LB(resultater):
+    return _hist_ventetider(resultater[1], 'Fordelingen af ventetider med en landingsbane')
 
-(ax1, ax2), (ax3, ax4) = axs
-ax1.hist(ventetider2[0], bins=20, density=True, color='firebrick', label='2020')
-ax1.legend(loc = 'upper right')
 
-ax2.hist(ventetider2[3], bins=20, density=True, color='navy', label='2023')
-ax2.legend(loc = 'upper right')
+def hist_ventetider_2LB(resultater):
+    return _hist_ventetider(resultater[2], 'Fordelingen af ventetider med to landingsbaner')
 
-ax3.hist(ventetider2[6], bins=20, density=True, color='forestgreen', label='2026')
-ax3.legend(loc = 'upper right')
 
-ax4.hist(ventetider2[9], bins=20, density=True, color='darkorange', label='2029')
-ax4.legend(loc = 'upper right')
+def hist_lukketider(resultater):
+    #histogram over fordelingen af lukketider for en og to landingsbaner
+    år = resultater[1].shape[0] - 1
+    fig, axs = plt.subplots(2, 2)
+    fig.suptitle('Fordelingen af lukketider med en og to landingsbaner')
 
-fig.text(0.5, 0.02, 'Ventetid i sekunder', ha='center')
-fig.text(0.02, 0.5, 'Tæthed', va='center', rotation='vertical')
+    (ax1, ax2), (ax3, ax4) = axs
+    for ax, k, i, farve in ((ax1, 1, 0, 'firebrick'), (ax2, 2, 0, 'navy'), (ax3, 1, min(6, år), 'forestgreen'), (ax4, 2, min(6, år), 'darkorange')):
+        ax.hist(resultater[k].over_lukketid[i], bins=20, density=True, color=farve, label=str(START_ÅR+i))
+        ax.legend(loc = 'upper left')
+    ax1.set_title('En landingsbane')
+    ax2.set_title('To landingsbaner')
 
-plt.savefig('hist_ventetider_2LB.png', dpi = 500, bbox_inches = 'tight')
+    fig.text(0.5, 0.02, 'Lukketid i sekunder', ha='center')
+    fig.text(0.02, 0.5, 'Tæthed', va='center', rotation='vertical')
+    return fig
 
 
-"""
-Histogram over fordelingen af lukketider for en og to landingsbaner
-"""
+def hale_ventetider(resultater):
+    #kvantilerne af ventetiderne over alle fly hvert år og den værste lukketid, med en og to landingsbaner
+    år, årstal = _årstal(resultater)
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
+    fig.suptitle(f'Halen af ventetiderne og den værste lukketid over {år} år')
 
+    for k, farve, navn in ((1, 'firebrick', 'En landingsbane'), (2, 'navy', 'To landingsbaner')):
+        hale = resultater[k].hale()
+        for kvantil, stil in (('p50', ':'), ('p95', 'o-'), ('p99', 's--')):
+            ax1.plot(årstal, hale[kvantil], stil, color=farve, label=f'{navn}, {kvantil}')
+        ax2.plot(årstal, hale['over_lukketid_max'], 'o-', color=farve, label=navn)
 
-fig, axs = plt.subplots(2, 2)
-fig.suptitle('Fordelingen af lukketider med en og to landingsbaner')
+    for ax, ylabel in ((ax1, 'Ventetid i sekunder'), (ax2, 'Værste lukketid i sekunder')):
+        ax.set_xticks(np.linspace(START_ÅR, START_ÅR+år, int(år/2+1)))
+        ax.set_xlabel('Årstal'); ax.set_ylabel(ylabel)
+        ax.legend(loc = 'upper left', fontsize=10)
+    fig.tight_layout()
+    return fig
 
-(ax1, ax2), (ax3, ax4) = axs
-ax1.hist(over_lukketid[0], bins=20, density=True, color='firebrick', label='2020')
-ax1.legend(loc = 'upper left')
-ax1.set_title('En landingsbane')
 
-ax2.hist(over_lukketid2[0], bins=20, density=True, color='navy', label='2020')
-ax2.legend(loc = 'upper left')
-ax2.set_title('To landingsbaner')
+FIGURER = {funktion.__name__: funktion for funktion in (gns_ventetider, gns_andel_fly_der_venter, gns_lukketid,
+                                                        hist_ventetider_1LB, hist_ventetider_2LB, hist_lukketider,
+                                                        hale_ventetider)}
 
-ax3.hist(over_lukketid[6], bins=20, density=True, color='forestgreen', label='2026')
-ax3.legend(loc = 'upper left')
 
-ax4.hist(over_lukketid2[6], bins=20, density=True, color='darkorange', label='2026')
-ax4.legend(loc = 'upper left')
+"""
+Tredje sektion indeholder tegningen af figurerne i flere processer.
+"""
 
-fig.text(0.5, 0.02, 'Lukketid i sekunder', ha='center')
-fig.text(0.02, 0.5, 'Tæthed', va='center', rotation='vertical')
 
-plt.savefig('hist_lukketider.png', dpi = 500, bbox_inches = 'tight')
\ No newline at end of file
+def _tegn(opgave):
+    #tegner og gemmer en figur i en proces, som selv indlæser de memory-mappede resultater
+    navn, mappe, ud, formater, dpi = opgave
+    _stil()
+    fig = FIGURER[navn](indlæs(mappe))
+    filer = []
+    for format in formater:
+        fil = os.path.join(ud, f'{navn}.{format}')
+        fig.savefig(fil, dpi = dpi, bbox_inches = 'tight')
+        filer.append(fil)
+    plt.close(fig)
+    return filer
+
+
+def plot(figurer=None, mappe=MAPPE, ud='.', formater=('png',), dpi=500, workers=None):
+    #tegner de valgte figurer, hver figur i sin egen proces
+    opgaver = [(navn, mappe, ud, tuple(formater), dpi) for navn in (figurer or FIGURER)]
+    os.makedirs(ud, exist_ok = True)
+
+    if workers == 1:
+        svar = list(map(_tegn, opgaver))
+    else:
+        with ProcessPoolExecutor(min(workers or os.cpu_count(), len(opgaver))) as pool:
+            svar = list(pool.map(_tegn, opgaver))
+
+    return [fil for filer in svar for fil in filer]
+
+
+if __name__ == '__main__': #processerne i ProcessPoolExecutor må ikke køre scriptet igen
+
+    parser = argparse.ArgumentParser(description = 'Simulerer lufthavnen og gemmer figurer.')
+    parser.add_argument('trin', nargs = '?', choices = ('simuler', 'plot'), help = 'kør kun et af trinene')
+    parser.add_argument('--mappe', default = MAPPE, help = 'mappen med de gemte resultater')
+    parser.add_argument('--no-cache', action = 'store_true', help = 'simulerer forfra uden at bruge cachen')
+    parser.add_argument('--år', type = int, help = 'antal år, standard er 12')
+    parser.add_argument('--dage', type = int, help = 'antal dage hvert år, standard er 300')
+    parser.add_argument('--n', type = int, help = 'gennemsnitlig mængde fly i det første år, standard er 200')
+    parser.add_argument('--seed', type = int, help = 'standard er 1')
+    parser.add_argument('--figurer', nargs = '+', choices = list(FIGURER), help = 'figurerne som tegnes, standard er alle')
+    parser.add_argument('--format', nargs = '+', default = ['png'], help = 'filformater, fx png pdf svg')
+    parser.add_argument('--dpi', type = int, default = 500)
+    parser.add_argument('--ud', default = '.', help = 'mappen som figurerne gemmes i')
+    parser.add_argument('--workers', type = int, default = None, help = 'antal processer som tegner figurerne')
+    args = parser.parse_args()
+
+    givne = {navn: getattr(args, navn) for navn in STANDARD if getattr(args, navn) is not None}
+    gemte = gemte_parametre(args.mappe)
+
+    if args.trin == 'plot': #tegner kun de gemte resultater, og kun hvis de er simuleret med de givne parametre
+        if gemte is None:
+            parser.error(f'der er ingen resultater med {PARAMETRE} i {args.mappe}, kør først simuler')
+        forskellige = [f'--{navn} {værdi} (gemt {gemte.get(navn)})' for navn, værdi in givne.items() if gemte.get(navn) != værdi]
+        if forskellige:
+            parser.error(f'resultaterne i {args.mappe} er simuleret med andre parametre: ' + ', '.join(forskellige) + ', kør simuler igen')
+    else:
+        parametre = {**STANDARD, **givne}
+        if args.trin == 'simuler' or gemte != parametre or args.no_cache:
+            simuler(**parametre, mappe = args.mappe, brug_cache = not args.no_cache)
+
+    if args.trin != 'simuler':
+        for fil in plot(args.figurer, args.mappe, args.ud, args.format, args.dpi, args.workers):
+            print(fil)
\ No newline at end of file
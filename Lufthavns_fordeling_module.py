@@ -0,0 +1,221 @@
+"""
+@author: Mikkel Hviid Thorn og Rebekka Engelund Balle
+
+
+Information
+Modulet indeholder fordelinger af landingstiderne, som kan bruges i stedet for de faste vægte i fly.
+En fordeling kan dannes fra kategorierne i fly eller estimeres fra observerede landingstider i en CSV eller .npy fil.
+
+Fordelinger:
+- LandingTimeDistribution -> en diskret fordeling på hele sekunder.
+- GrupperetFordeling -> en LandingTimeDistribution for hver gruppe, fx hver time på dagen eller hver flytype.
+
+Der trækkes med alias metoden. For en fordeling på K værdier udregnes en gang en tabel med K sandsynligheder og K aliaser.
+Et træk er så et uniformt indeks i og et uniformt tal u, hvor resultatet er værdi i hvis u < sandsynlighed[i] og ellers
+aliaset for i. Hvert træk koster derfor det samme uanset K, og mange træk laves på en gang med numpy.
+
+Begge fordelinger har metoden landingstider(ankomsttider, rng), som fly bruger, når den får en fordeling.
+
+
+Ordbog
+- værdier er de mulige landingstider i sekunder.
+- gruppe er fx timen ankomsttid//3600 eller en flytype.
+"""
+
+
+import numpy as np
+import numpy.random as npr
+import Lufthavns_simulation_module as lsm
+
+
+def _læs(sti, kolonne):
+    #læser en kolonne fra en .npy fil eller en CSV fil, hvor kolonnen er et nummer eller navnet i første linje
+    if str(sti).endswith('.npy'):
+        data = np.load(sti)
+        return data if data.ndim == 1 else data[:,kolonne]
+    if isinstance(kolonne, str):
+        return np.genfromtxt(sti, delimiter = ',', names = True, dtype = None, encoding = 'utf-8')[kolonne]
+    return np.loadtxt(sti, delimiter = ',', usecols = kolonne, ndmin = 1)
+
+
+class LandingTimeDistribution:
+    """
+    En diskret fordeling af landingstider, som der trækkes fra med alias metoden.
+
+    Input
+    værdier -> de mulige landingstider i hele sekunder.
+    vægte -> vægten af hver landingstid. De behøver ikke summe til 1.
+
+    Eksempel
+    >>> fordeling = LandingTimeDistribution([60, 90, 120], [1, 2, 1])
+    >>> fordeling.sample(8, np.random.default_rng(1))
+    array([ 90,  90,  90, 120,  60,  60,  90, 120], dtype=int32)
+    >>> fordeling.momenter()
+    (90.0, 8550.0)
+    """
+
+    def __init__(self, værdier, vægte):
+        værdier = np.asarray(værdier, dtype = np.int32)
+        p = np.asarray(vægte, dtype = np.float64)
+        if len(værdier) != len(p) or len(p) == 0:
+            raise ValueError('der skal være lige mange værdier og vægte, og mindst en af hver')
+        if np.any(p < 0) or np.sum(p) <= 0:
+            raise ValueError('vægtene skal være ikke-negative med en positiv sum')
+
+        self.værdier, self.p = værdier, p/np.sum(p)
+        self.sandsynlighed, self.alias = self._alias_tabel(self.p)
+
+    @staticmethod
+    def _alias_tabel(p):
+        #Voses metode, hvor hver søjle fyldes op til 1 med en værdi fra en søjle som har for meget
+        K = len(p)
+        skaleret = p*K
+        sandsynlighed = np.ones(K)
+        alias = np.arange(K)
+        små = [i for i in range(K) if skaleret[i] < 1]
+        store = [i for i in range(K) if skaleret[i] >= 1]
+
+        while små and store:
+            i, j = små.pop(), store.pop()
+            sandsynlighed[i], alias[i] = skaleret[i], j
+            skaleret[j] -= 1 - skaleret[i]
+            (små if skaleret[j] < 1 else store).append(j)
+
+        return sandsynlighed, alias #søjlerne som er tilbage er fulde på grund af afrundingsfejl
+
+    @classmethod
+    def fra_kategorier(cls, vægte=lsm.LANDINGSVÆGTE, bredde=30, start=31):
+        """
+        Fordelingen i fly, hvor kategori i har vægten vægte[i] og landingstiderne start+bredde*i til start+bredde*i+bredde-2
+        er lige sandsynlige.
+
+        Eksempel
+        >>> LandingTimeDistribution.fra_kategorier().momenter()
+        (122.7, 17539.0)
+        """
+
+        værdier = (start + bredde*np.arange(len(vægte))[:,None] + np.arange(bredde-1)).ravel()
+        return cls(værdier, np.repeat(vægte, bredde-1))
+
+    @classmethod
+    def fit(cls, landingstider):
+        """
+        Den empiriske fordeling af observerede landingstider, som afrundes til hele sekunder.
+
+        Eksempel
+        >>> LandingTimeDistribution.fit([61.2, 90, 90.4, 120]).p
+        array([0.25, 0.5 , 0.25])
+        """
+
+        værdier, antal = np.unique(np.rint(np.asarray(landingstider, dtype = np.float64)).astype(np.int32), return_counts = True)
+        return cls(værdier, antal)
+
+    @classmethod
+    def fra_fil(cls, sti, kolonne=0):
+        """
+        Estimerer fordelingen fra en kolonne med landingstider i en CSV fil eller en .npy fil, se fit.
+        I en CSV fil kan kolonnen være et nummer, eller navnet på kolonnen i første linje.
+        """
+
+        return cls.fit(_læs(sti, kolonne))
+
+    def sample(self, size, rng=None):
+        """
+        Trækker size landingstider som et int32 array.
+
+        Input
+        size -> antallet af landingstider.
+        rng -> en numpy.random.Generator. Hvis den er None bruges den globale tilstand i numpy.random.
+        """
+
+        if rng is None:
+            i, u = npr.randint(0, len(self.værdier), size = size), npr.random(size)
+        else:
+            i, u = rng.integers(0, len(self.værdier), size = size), rng.random(size)
+        return np.where(u < self.sandsynlighed[i], self.værdier[i], self.værdier[self.alias[i]])
+
+    def landingstider(self, ankomsttider, rng=None):
+        #landingstider til flyene med ankomsttiderne, som ikke afhænger af ankomsttiden
+        return self.sample(len(ankomsttider), rng)
+
+    def momenter(self):
+        #første og andet moment, som i Lufthavns_analytisk_module.landingstid_momenter
+        ES = np.sum(self.p*self.værdier)
+        ES2 = np.sum(self.p*self.værdier.astype(np.float64)**2)
+        return round(float(ES), 10), round(float(ES2), 10)
+
+
+class GrupperetFordeling:
+    """
+    En LandingTimeDistribution for hver gruppe, fx hver time på dagen eller hver flytype.
+    Grupper uden en fordeling bruger standard fordelingen.
+
+    Input
+    fordelinger -> en dictionary med en LandingTimeDistribution for hver gruppe.
+    standard -> fordelingen for grupper, som ikke er i fordelinger. Hvis den er None, giver de en KeyError.
+    time_bredde -> med et tal er gruppen for et fly ankomsttid//time_bredde i landingstider, så grupperne er timer
+    når time_bredde er 3600. Med None skal grupperne gives direkte til sample.
+
+    Eksempel
+    >>> fordeling = GrupperetFordeling.fit([60, 60, 200, 220], [0, 0, 1, 1], time_bredde = 3600)
+    >>> fordeling.landingstider(np.array([100, 200, 4000, 5000]), np.random.default_rng(1)).tolist()
+    [60, 60, 200, 200]
+    """
+
+    def __init__(self, fordelinger, standard=None, time_bredde=None):
+        self.fordelinger, self.standard, self.time_bredde = dict(fordelinger), standard, time_bredde
+
+    @classmethod
+    def fit(cls, landingstider, grupper, standard=True, time_bredde=None):
+        """
+        Estimerer en empirisk fordeling for hver gruppe.
+
+        Input
+        landingstider -> observerede landingstider.
+        grupper -> gruppen for hver observation.
+        standard -> med True er standard fordelingen den empiriske fordeling af alle observationer.
+        time_bredde -> se GrupperetFordeling.
+        """
+
+        landingstider, grupper = np.asarray(landingstider), np.asarray(grupper)
+        fordelinger = {gruppe.item(): LandingTimeDistribution.fit(landingstider[grupper == gruppe]) for gruppe in np.unique(grupper)}
+        return cls(fordelinger, LandingTimeDistribution.fit(landingstider) if standard else None, time_bredde)
+
+    @classmethod
+    def fra_fil(cls, sti, kolonne=0, gruppe_kolonne=1, standard=True, time_bredde=None):
+        """
+        Estimerer fordelingerne fra en kolonne med landingstider og en kolonne med grupper i en CSV fil eller .npy fil.
+        """
+
+        return cls.fit(_læs(sti, kolonne), _læs(sti, gruppe_kolonne), standard, time_bredde)
+
+    def _fordeling(self, gruppe):
+        if gruppe in self.fordelinger:
+            return self.fordelinger[gruppe]
+        if self.standard is None:
+            raise KeyError(f'der er ingen fordeling for gruppen {gruppe!r}')
+        return self.standard
+
+    def sample(self, grupper, rng=None):
+        """
+        Trækker en landingstid for hver gruppe i grupper som et int32 array. Hver gruppe trækkes for sig på en gang.
+        """
+
+        grupper = np.asarray(grupper)
+        landingstider = np.empty(len(grupper), dtype = np.int32)
+        for gruppe in np.unique(grupper):
+            maske = grupper == gruppe
+            landingstider[maske] = self._fordeling(gruppe.item()).sample(int(np.count_nonzero(maske)), rng)
+        return landingstider
+
+    def landingstider(self, ankomsttider, rng=None):
+        #landingstider til flyene, hvor gruppen er timen for ankomsttiden
+        if self.time_bredde is None:
+            raise ValueError('fly kan kun bruge en GrupperetFordeling med time_bredde, da grupperne ellers ikke kendes')
+        return self.sample(np.asarray(ankomsttider)//self.time_bredde, rng)
+
+
+
+if  __name__ == '__main__':
+   import doctest
+   print(doctest.testmod())
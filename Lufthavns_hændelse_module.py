@@ -0,0 +1,235 @@
+"""
+@author: Mikkel Hviid Thorn og Rebekka Engelund Balle
+
+
+Information
+Modulet indeholder en hændelsesbaseret simulering af lufthavnen, som kan mere end rekursionerne i en_dag og en_dag_2LB.
+Tiden springer fra hændelse til hændelse, og de kommende hændelser ligger i en binær heap sorteret efter tidspunkt.
+
+Hændelser:
+- ankomst -> en operation ankommer og stiller sig bagerst i køen. Hver kilde har højst en ankomst i heapen ad gangen,
+  og den næste operation hentes først fra kilden, når den forrige er ankommet. Kilderne kan derfor være generatorer.
+- klar -> den forreste operation i køen kan starte, fordi en landingsbane er blevet fri.
+
+Modellen:
+- Operationer er landinger og afgange, som deler landingsbanerne og afvikles i den rækkefølge de ankommer.
+- En landingsbane kan være lukket i tidsrum. En operation må hverken starte eller være i gang, mens banen er lukket.
+- Efter en operation skal der gå en separation før den næste på samme bane, som afhænger af kategorierne af de to
+  operationer. Kategorien er landingstidens kategori fra fly, altså (varighed-31)//30.
+- Den forreste operation starter på den bane, hvor den kan starte først. Ved lighed bruges banen med det laveste nummer.
+
+Uden afgange, lukninger og separation giver simuler de samme ventetider og den samme lukketid som en_dag_k,
+når den får de samme fly.
+
+
+Ordbog
+- operation er en landing eller en afgang, med et ankomsttidspunkt og en varighed på landingsbanen.
+- for landinger er ankomsten når flyet ankommer til lufthavnen, og for afgange når flyet er klar til at lette.
+- LB er tidspunktet hvor en landingsbane er fri.
+"""
+
+
+import heapq
+from collections import deque
+from itertools import count
+import numpy as np
+import numpy.random as npr
+import Lufthavns_simulation_module as lsm
+
+
+ANKOMST, KLAR = 0, 1 #typerne af hændelser
+
+
+"""
+Første sektion indeholder en udgave af fly, som danner flyene et ad gangen.
+"""
+
+
+def fly_strøm(n, rng=None, blok=256):
+    """
+    Danner fly med samme fordeling som Lufthavns_simulation_module.fly, men som en generator, der giver et fly ad gangen
+    i rækkefølge efter ankomsttiden uden at sortere hele dagen.
+    De sorterede ankomsttider dannes direkte som ordnede uniforme variable, hvor
+    1-U_(i) = (1-U_(i-1)) * V_i^(1/(x-i+1)) for uafhængige uniforme V_i. Det gøres for en blok fly ad gangen.
+
+    Input
+    n -> er lambda værdien i vores poisson fordeling. Det skal symbolisere den gennemsnitlige mængde fly.
+    rng -> en numpy.random.Generator som flyene trækkes fra. Hvis den er None bruges den globale tilstand i numpy.random.
+    blok -> antallet af fly som dannes ad gangen.
+
+    Output
+    en generator med (ankomsttid, landingstid) for hvert fly.
+
+    Eksempel
+    >>> f = list(fly_strøm(200, np.random.default_rng(1)))
+    >>> len(f), all(a <= b for (a, s), (b, t) in zip(f, f[1:])), all(31 <= s <= 269 for a, s in f)
+    (200, True, True)
+    """
+
+    poisson, uniform, heltal = (npr.poisson, npr.random, npr.randint) if rng is None else (rng.poisson, rng.random, rng.integers)
+    x = poisson(n) #antal fly
+    log_rest, i = 0.0, 0 #log(1-U) for det sidste fly og antallet af fly dannet
+
+    while i < x:
+        b = min(blok, x - i)
+        tilbage = x - i - np.arange(b) #antallet af fly som mangler, inklusiv det nuværende
+        log_rest_blok = log_rest + np.cumsum(np.log1p(-uniform(b))/tilbage)
+        ankomsttider = np.minimum((-np.expm1(log_rest_blok)*(13*60*60)).astype(np.int64), 13*60*60-1)
+        landingstider = lsm._landingstider(heltal(0, 200*29, size = b))
+        log_rest, i = log_rest_blok[-1], i + b
+
+        yield from zip(ankomsttider.tolist(), landingstider.tolist())
+
+
+"""
+Anden sektion indeholder selve simuleringen.
+"""
+
+
+class Operation:
+    """
+    En landing eller afgang i simuleringen.
+    """
+
+    __slots__ = ('ankomst', 'varighed', 'kategori', 'afgang', 'start', 'bane')
+
+    def __init__(self, ankomst, varighed, kategori, afgang):
+        self.ankomst, self.varighed, self.kategori, self.afgang = ankomst, varighed, kategori, int(afgang)
+        self.start, self.bane = None, None
+
+
+def simuler(ankomster, k=1, afgange=None, lukninger=(), separation=None):
+    """
+    Simulerer en dag i lufthavnen med hændelser.
+
+    Input
+    ankomster -> fly som (ankomsttid, landingstid) sorteret efter ankomsttid, fx en liste, et array fra fly eller fly_strøm.
+    k -> antallet af landingsbaner.
+    afgange -> afgange som (klar tidspunkt, varighed) sorteret efter tidspunktet, eller None.
+    lukninger -> en liste med (start, slut, bane) for tidsrum hvor en bane er lukket.
+    separation -> en matrix hvor separation[i][j] er sekunderne der skal gå fra en operation af kategori i slutter,
+    til en operation af kategori j kan starte på samme bane, eller None.
+
+    Output
+    ventetider -> en liste med ventetiden for hver landing, også dem som ikke venter.
+    ventetider_afgang -> en liste med ventetiden for hver afgang.
+    LB -> hvornår den sidste operation er afsluttet på en af landingsbanerne.
+
+    Eksempel
+    >>> f = lsm.fly(200, np.random.default_rng(3))
+    >>> ventetider, ventetider_afgang, LB = simuler(f, 2)
+    >>> [v for v in ventetider if v != 0] == lsm.lbm.kø_k(f[:,0], f[:,1], 2, 'python')[0], bool(LB == lsm.lbm.kø_k(f[:,0], f[:,1], 2, 'python')[1])
+    (True, True)
+
+    >>> simuler([(0, 100), (10, 100)], 1, afgange = [(5, 60)], separation = [[0]*8 for i in range(8)])
+    ([0, 150], [95], 260)
+    >>> simuler([(0, 100), (10, 100)], 1, lukninger = [(150, 400, 0)])
+    ([0, 390], [], 500)
+    """
+
+    kategorier = len(separation) if separation is not None else 8
+    lukket = [sorted((s, e) for s, e, bane in lukninger if bane == b) for b in range(k)]
+    simpel = separation is None and not lukninger #så er banen kun bestemt af hvornår den er fri
+
+    kilder = [iter(ankomster)] + ([iter(afgange)] if afgange is not None else [])
+    heap, nr = [], count() #nr gør rækkefølgen entydig, når hændelser sker på samme tidspunkt
+    heappush, heapreplace, heappop = heapq.heappush, heapq.heapreplace, heapq.heappop
+
+    for kilde, operationer in enumerate(kilder): #den første ankomst fra hver kilde
+        for tid, varighed in operationer:
+            heappush(heap, (tid, next(nr), ANKOMST, Operation(tid, varighed, min(max((varighed-31)//30, 0), kategorier-1), kilde == 1)))
+            break
+
+    kø = deque()
+    LB = [0]*k
+    fri = [(0, bane) for bane in range(k)] #en min-heap med (LB, bane), som bruges når banerne kun adskiller sig ved LB
+    sidste = [-1]*k #kategorien af den sidste operation på hver bane
+    ventetider, ventetider_afgang = [], []
+
+    while heap:
+        tid, _, type, operation = heap[0]
+        if type == ANKOMST:
+            kø.append(operation)
+            for næste, varighed in kilder[operation.afgang]: #henter den næste operation fra samme kilde i stedet for ankomsten
+                heapreplace(heap, (næste, next(nr), ANKOMST, Operation(næste, varighed, min(max((varighed-31)//30, 0), kategorier-1), operation.afgang)))
+                break
+            else: #kilden er tom
+                heappop(heap)
+            if len(kø) > 1: #den forreste operation venter allerede på en klar hændelse
+                continue
+        else:
+            heappop(heap)
+
+        while kø: #starter operationer fra forrest i køen, så længe det er muligt
+            operation = kø[0]
+            if simpel:
+                start, bane = fri[0]
+                if start < tid:
+                    start = tid
+            else:
+                start, bane = _tidligste_start(operation, tid, LB, sidste, lukket, separation)
+
+            if start > tid: #den forreste operation kan først starte senere
+                heappush(heap, (start, next(nr), KLAR, operation))
+                break
+
+            kø.popleft()
+            operation.start, operation.bane = start, bane
+            LB[bane], sidste[bane] = start + operation.varighed, operation.kategori
+            if simpel:
+                heapreplace(fri, (LB[bane], bane))
+            if operation.afgang:
+                ventetider_afgang.append(start - operation.ankomst)
+            else:
+                ventetider.append(start - operation.ankomst)
+
+    return ventetider, ventetider_afgang, max(LB)
+
+
+def _tidligste_start(operation, tid, LB, sidste, lukket, separation):
+    #det tidligste tidspunkt og den bane, hvor operationen kan starte med separation og lukninger
+    bedst, bedst_bane = None, None
+    for bane in range(len(LB)):
+        start = max(tid, LB[bane])
+        if separation is not None and sidste[bane] >= 0:
+            start = max(start, LB[bane] + separation[sidste[bane]][operation.kategori])
+        for s, e in lukket[bane]: #lukningerne er sorteret, så en operation som skubbes forbi en lukning tjekkes mod de næste
+            if start < e and start + operation.varighed > s:
+                start = e
+        if bedst is None or start < bedst:
+            bedst, bedst_bane = start, bane
+    return bedst, bedst_bane
+
+
+def en_dag_hændelser(n,k=1,afgange=None,lukninger=(),separation=None,rng=None):
+    """
+    Simulerer en dag i lufthavnen med hændelser, hvor flyene dannes løbende med fly_strøm.
+
+    Input
+    n -> skal symbolisere den gennemsnitlige mængde fly.
+    k, lukninger, separation -> som i simuler.
+    afgange -> det gennemsnitlige antal afgange, som dannes med fly_strøm, eller None.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly_strøm.
+
+    Output
+    ventetider -> en liste med ventetiderne for alle fly, som skal vente med at lande.
+    fly_der_venter -> brøkdelen af fly, som skal vente med at lande.
+    over_lukketid -> hvornår den sidste operation er afsluttet i forhold til lukketid.
+
+    Eksempel
+    >>> ventetider, fly_der_venter, over_lukketid = en_dag_hændelser(200, 2, afgange = 50, rng = np.random.default_rng(1))
+    >>> 0 <= fly_der_venter <= 1, all(v > 0 for v in ventetider)
+    (True, True)
+    """
+
+    afgange = fly_strøm(afgange, rng) if afgange is not None else None
+    alle, ventetider_afgang, LB = simuler(fly_strøm(n, rng), k, afgange, lukninger, separation)
+    ventetider = [v for v in alle if v != 0]
+
+    return ventetider, len(ventetider)/len(alle) if alle else np.nan, LB - 13*60*60
+
+
+
+if  __name__ == '__main__':
+   import doctest
+   print(doctest.testmod())
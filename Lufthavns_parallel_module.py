@@ -0,0 +1,164 @@
+"""
+@author: Mikkel Hviid Thorn og Rebekka Engelund Balle
+
+
+Information
+Modulet kører simuleringerne fra Lufthavns_simulation_module på flere processer.
+Hvert år deles op i bidder af dage, og hver bid er en opgave som køres i en ProcessPoolExecutor.
+
+Tilfældighed:
+- Hver opgave har sin egen numpy.random.Generator.
+- Generatoren dannes fra en SeedSequence med seed og nøglen (k, år, bid), så strømmene er uafhængige.
+- Opgaverne og deres nøgler afhænger ikke af antallet af processer, så resultaterne er de samme uanset antal processer.
+- Den globale tilstand i numpy.random bruges ikke.
+
+
+Ordbog
+- l, m, n er diskrete antal som i Lufthavns_simulation_module
+- k er antallet af landingsbaner
+- bid er et antal dage fra samme år, som køres i en opgave
+
+Alle drivere kører opgaverne med kør_opgaver, som giver de rå målinger for hver dag. l_år_parallel laver dem om til
+lister som l_år_k, og Lufthavns_resultat_module.l_år_resultat samler dem i et Resultat, så begge bruger de samme træk.
+"""
+
+
+import os
+import numpy as np
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+import Lufthavns_backend_module as lbm
+import Lufthavns_simulation_module as lsm
+
+
+def _kør_opgave(opgave, ventetider=True):
+    #kører en bid dage i en proces med sin egen generator og giver et (m, 4) array med gennemsnitlig ventetid,
+    #brøkdelen af fly der venter, over_lukketid og antallet af fly for hver dag, og eventuelt ventetiderne for hver dag
+    m, n, k, seed, nøgle, backend, intensitet = opgave
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key = nøgle))
+
+    dage = np.empty((m, 4))
+    bid_ventetider = []
+    for d in range(m): #samme træk i samme rækkefølge som m_dage_k
+        fly_liste = lsm.fly(n, rng, intensitet = intensitet)
+        vt, LB = lbm.kø_k(fly_liste[:,0], fly_liste[:,1], k, backend)
+        dage[d] = np.mean(vt) if len(vt) > 0 else np.nan, len(vt)/len(fly_liste), LB - 13*60*60, len(fly_liste)
+        if ventetider:
+            bid_ventetider.append(np.asarray(vt, dtype = np.int32))
+
+    return dage, bid_ventetider
+
+
+def kør_opgaver(opgaver, workers=None, ventetider=True):
+    """
+    Kører opgaverne fra opgaver på flere processer.
+
+    Input
+    opgaver -> en liste med opgaver fra opgaver.
+    workers -> antallet af processer. Med workers = 1 køres opgaverne i denne proces.
+    ventetider -> om ventetiderne for hver dag også gives. Uden dem sendes der kun et lille array tilbage fra hver proces.
+
+    Output
+    en liste med (dage, ventetider) for hver opgave, hvor dage er et (m, 4) array med gennemsnitlig ventetid (nan hvis intet
+    fly venter), brøkdelen af fly der venter, over_lukketid og antallet af fly for hver dag, og ventetider er en liste med
+    et int32 array for hver dag, eller en tom liste.
+
+    Eksempel
+    >>> (dage, ventetider), = kør_opgaver(opgaver(0, 3, 200, 1)[:1], workers = 1)
+    >>> dage.shape, len(ventetider), bool(np.all(dage[:,1] == [len(vt) for vt in ventetider]/dage[:,3]))
+    ((3, 4), 3, True)
+    """
+
+    kør = partial(_kør_opgave, ventetider = ventetider)
+    if workers == 1:
+        return list(map(kør, opgaver))
+    with ProcessPoolExecutor(workers or os.cpu_count()) as pool:
+        return list(pool.map(kør, opgaver))
+
+
+def opgaver(l, m, n, k, seed=1, bid=25, backend=None, vækst=1.05, intensitet=None):
+    """
+    Deler l år med m dage op i opgaver på højst bid dage.
+
+    Input
+    l, m, n, k -> som i l_år_k.
+    seed -> seed til SeedSequence.
+    bid -> det største antal dage i en opgave.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    vækst -> faktoren som flytrafikken vokser med hvert år.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se Lufthavns_simulation_module._ankomsttider.
+
+    Output
+    en liste med (m, n, k, seed, nøgle, backend, intensitet) for hver opgave, sorteret efter år og dag.
+
+    Eksempel
+    >>> [opgave[:2] for opgave in opgaver(1, 60, 200, 1)]
+    [(25, 200), (25, 200), (10, 200), (25, 210), (25, 210), (10, 210)]
+    """
+
+    return [(min(bid, m-start), int(n*vækst**i), k, seed, (k, i, start//bid), backend, intensitet)
+            for i in range(0, l+1) for start in range(0, m, bid)]
+
+
+def sweep_parallel(l, m, n, ks=(1, 2), seed=1, workers=None, bid=25, backend=None, vækst=1.05, intensitet=None):
+    """
+    Simulerer l år i lufthavnen for flere antal landingsbaner på en gang.
+    Alle opgaver for alle antal landingsbaner sendes til den samme ProcessPoolExecutor, så processerne altid har arbejde.
+
+    Input
+    l -> antallet af år simuleret.
+    m -> antallet af dage simuleret.
+    n -> skal symbolisere den gennemsnitlige mængde fly.
+    ks -> antallene af landingsbaner.
+    seed -> seed til SeedSequence, som alle generatorer dannes fra.
+    workers -> antallet af processer. Med workers = 1 køres opgaverne i denne proces.
+    bid -> det største antal dage i en opgave.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    vækst -> faktoren som flytrafikken vokser med hvert år.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se Lufthavns_simulation_module._ankomsttider.
+
+    Output
+    en dictionary som for hvert k har samme output som l_år_k.
+    """
+
+    alle = [opgave for k in ks for opgave in opgaver(l, m, n, k, seed, bid, backend, vækst, intensitet)]
+    svar = kør_opgaver(alle, workers, ventetider = False)
+
+    resultater = {k: ([[] for i in range(l+1)], [[] for i in range(l+1)], [[] for i in range(l+1)]) for k in ks}
+    for opgave, (dage, bid_ventetider) in zip(alle, svar): #samler bidderne i samme rækkefølge som opgaverne, ventetiderne er tomme
+        k, i = opgave[4][:2]
+        ventetider, fly_der_venter, over_lukketid = resultater[k]
+        ventetider[i].extend(dage[:,0].tolist())
+        fly_der_venter[i].extend(dage[:,1].tolist())
+        over_lukketid[i].extend(dage[:,2].astype(np.int64).tolist())
+
+    return resultater
+
+
+def l_år_parallel(l, m, n, k=1, seed=1, workers=None, bid=25, backend=None, vækst=1.05, intensitet=None):
+    """
+    Simulerer l år i lufthavnen med k landingsbaner på flere processer.
+
+    Input
+    l, m, n, k -> som i l_år_k.
+    seed, workers, bid, backend, vækst, intensitet -> som i sweep_parallel.
+
+    Output
+    samme output som l_år_k.
+    """
+
+    return sweep_parallel(l, m, n, (k,), seed, workers, bid, backend, vækst, intensitet)[k]
+
+
+def l_år_2LB_parallel(l, m, n, seed=1, workers=None, bid=25, backend=None, vækst=1.05, intensitet=None):
+    """
+    Simulerer l år i lufthavnen med to landingsbaner på flere processer, se l_år_parallel.
+    """
+
+    return l_år_parallel(l, m, n, 2, seed, workers, bid, backend, vækst, intensitet)
+
+
+
+if  __name__ == '__main__':
+   import doctest
+   print(doctest.testmod())
@@ -0,0 +1,188 @@
+"""
+@author: Mikkel Hviid Thorn og Rebekka Engelund Balle
+
+
+Information
+Modulet måler hvor tiden går i simuleringen, fordelt på lagene i Lufthavns_simulation_module og Lufthavns_backend_module.
+Måling slås til med context manageren profil eller med miljøvariablen SIM_PROFILE.
+
+Mens målingen er slået til, erstattes funktionerne i LAG med udgaver som måler
+- antallet af kald,
+- tiden i funktionen inklusiv de lag den kalder, og tiden i funktionen selv,
+- antallet af fly som laget har behandlet,
+- ændringen i antallet af allokerede hukommelsesblokke fra sys.getallocatedblocks.
+Når målingen slås fra, sættes de oprindelige funktioner tilbage, så simuleringen kører uden ekstra arbejde.
+Funktionerne slås op ved navn hver gang de kaldes, så lagene måles også når de kaldes inde fra andre funktioner.
+Simuleringer i andre processer, fx fra Lufthavns_parallel_module, måles ikke.
+
+SIM_PROFILE
+- 1 eller tekst -> rapporten som tekst skrives til stderr, når programmet slutter.
+- en sti som ender på .json -> rapporten gemmes som JSON i filen.
+- en anden sti -> rapporten gemmes som tekst i filen.
+
+
+Ordbog
+- fase er navnet på et lag, fx fly, sortering, kø, en_dag, m_dage eller l_år.
+- egen tid er tiden i fasen minus tiden i de målte faser den kalder. For m_dage er det fx opbygningen af listerne.
+- blokke er ændringen i antallet af allokerede blokke, så den viser hvor meget der bliver liggende i hukommelsen.
+"""
+
+
+import os
+import sys
+import json
+import time
+import atexit
+from contextlib import contextmanager
+import Lufthavns_backend_module as lbm
+import Lufthavns_simulation_module as lsm
+
+
+#lagene som måles: (modul, funktionsnavn, fase, antal fly som laget behandler ud fra argumenterne og svaret, eller None)
+#faser uden en tæller får de fly, som er dannet mens de kørte
+LAG = [
+    (lsm, 'fly', 'fly', lambda args, svar: len(svar)),
+    (lsm, '_sorter', 'sortering', lambda args, svar: len(svar)),
+    (lbm, 'kø_k', 'kø', lambda args, svar: len(args[0])),
+    (lsm, 'en_dag_k', 'en_dag', None),
+    (lsm, 'm_dage_k', 'm_dage', None),
+    (lsm, 'l_år_k', 'l_år', None),
+    (lsm, 'fly_batch', 'fly_batch', lambda args, svar: int(svar[2].sum())),
+    (lsm, 'en_dag_batch', 'en_dag_batch', lambda args, svar: int(args[2].sum())),
+    (lsm, 'm_dage_batch', 'm_dage_batch', None),
+    (lsm, 'm_dage_strøm', 'm_dage_strøm', None),
+]
+DANNER_FLY = ('fly', 'fly_batch') #faserne som danner nye fly
+
+
+class Profil:
+    """
+    Målingerne for hver fase.
+
+    Eksempel
+    >>> with profil() as p:
+    ...     resultat = lsm.m_dage(5, 100, rng = lsm.np.random.default_rng(1))
+    >>> p.faser['m_dage']['kald'], p.faser['en_dag']['kald'], p.faser['fly']['fly'] == p.faser['kø']['fly'] == p.faser['m_dage']['fly']
+    (1, 5, True)
+    """
+
+    def __init__(self):
+        self.faser = {}
+        self.fly = 0 #fly dannet i alt
+        self._stak = [] #tiden brugt i målte faser under hver fase som kører lige nu
+
+    def _fase(self, navn):
+        if navn not in self.faser:
+            self.faser[navn] = {'kald': 0, 'sekunder': 0.0, 'egen_sekunder': 0.0, 'fly': 0, 'blokke': 0}
+        return self.faser[navn]
+
+    def mål(self, navn, funktion, tæl):
+        #giver en udgave af funktionen, som måler hvert kald under fasen navn
+        def målt(*args, **kwargs):
+            fly_før, blokke_før = self.fly, sys.getallocatedblocks()
+            self._stak.append(0.0)
+            t = time.perf_counter()
+            try:
+                svar = funktion(*args, **kwargs)
+            finally:
+                tid = time.perf_counter() - t
+                under = self._stak.pop()
+                if self._stak:
+                    self._stak[-1] += tid
+
+            fase = self._fase(navn)
+            fase['kald'] += 1
+            fase['sekunder'] += tid
+            fase['egen_sekunder'] += tid - under
+            fase['blokke'] += sys.getallocatedblocks() - blokke_før
+            if tæl is None:
+                fase['fly'] += self.fly - fly_før
+            else:
+                antal = tæl(args, svar)
+                fase['fly'] += antal
+                if navn in DANNER_FLY:
+                    self.fly += antal
+            return svar
+
+        målt.__wrapped__ = funktion
+        return målt
+
+    def rapport(self):
+        """
+        Målingerne som en dictionary med en dictionary for hver fase, sorteret efter tiden i fasen selv.
+        Hver fase har kald, sekunder, egen_sekunder, fly, fly_per_sekund og blokke.
+        """
+
+        rapport = {}
+        for navn, fase in sorted(self.faser.items(), key = lambda fase: -fase[1]['egen_sekunder']):
+            rapport[navn] = dict(fase, fly_per_sekund = fase['fly']/fase['sekunder'] if fase['sekunder'] > 0 else 0.0)
+        return rapport
+
+    def json(self):
+        #rapporten som JSON
+        return json.dumps(self.rapport(), indent = 2, ensure_ascii = False)
+
+    def tekst(self):
+        #rapporten som en tabel
+        rapport = self.rapport()
+        total = sum(fase['egen_sekunder'] for fase in rapport.values())
+        linjer = [f"{'fase':>14} {'kald':>9} {'sekunder':>10} {'egen':>10} {'andel':>7} {'fly':>11} {'fly/s':>12} {'blokke':>10}"]
+        for navn, fase in rapport.items():
+            andel = fase['egen_sekunder']/total if total > 0 else 0.0
+            linjer.append(f"{navn:>14} {fase['kald']:>9} {fase['sekunder']:>10.4f} {fase['egen_sekunder']:>10.4f} {andel:>7.1%} "
+                          f"{fase['fly']:>11} {fase['fly_per_sekund']:>12.0f} {fase['blokke']:>10}")
+        return '\n'.join(linjer)
+
+
+@contextmanager
+def profil(eksisterende=None):
+    """
+    Slår målingen af lagene til inden for with blokken.
+
+    Input
+    eksisterende -> en Profil som målingerne lægges til. Hvis den er None dannes en ny.
+
+    Output
+    en Profil med målingerne.
+    """
+
+    p = Profil() if eksisterende is None else eksisterende
+    originaler = [(modul, navn, getattr(modul, navn)) for modul, navn, fase, tæl in LAG]
+    for (modul, navn, fase, tæl), (_, _, funktion) in zip(LAG, originaler):
+        setattr(modul, navn, p.mål(fase, funktion, tæl))
+    try:
+        yield p
+    finally:
+        for modul, navn, funktion in originaler: #sætter de oprindelige funktioner tilbage
+            setattr(modul, navn, funktion)
+
+
+def start_fra_miljø():
+    """
+    Slår målingen til for resten af programmet ud fra miljøvariablen SIM_PROFILE og skriver rapporten, når programmet slutter.
+    Kaldes af Lufthavns_simulation_module, når SIM_PROFILE er sat.
+    """
+
+    mål = os.environ.get('SIM_PROFILE', '')
+    if mål in ('', '0'):
+        return None
+
+    måling = profil()
+    p = måling.__enter__()
+
+    def skriv():
+        måling.__exit__(None, None, None)
+        if mål in ('1', 'tekst'):
+            print(p.tekst(), file = sys.stderr)
+        else:
+            with open(mål, 'w', encoding = 'utf-8') as fil:
+                fil.write(p.json() if mål.endswith('.json') else p.tekst())
+
+    atexit.register(skriv)
+    return p
+
+
+
+if  __name__ == '__main__':
+   import doctest
+   print(doctest.testmod())
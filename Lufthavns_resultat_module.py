@@ -0,0 +1,170 @@
+"""
+@author: Mikkel Hviid Thorn og Rebekka Engelund Balle
+
+
+Information
+Modulet indeholder Resultat, som gemmer en simulering over flere år i sammenhængende numpy arrays i stedet for lister af lister.
+
+Resultat indeholder:
+- ventetider, fly_der_venter, over_lukketid og antal_fly -> arrays med formen (år, dage).
+- tom -> et bool array med formen (år, dage), som er True for dage hvor intet fly venter. Her er ventetiden nan.
+- alle_ventetider -> alle ventetider for alle fly som venter, lagt efter hinanden dag for dag.
+- start -> indekset i alle_ventetider hvor hver dag starter, så dag d i år i er alle_ventetider[start[i*dage+d]:start[i*dage+d+1]].
+
+Udsnit af et år er views af de samme arrays, så de kopieres ikke. Et Resultat kan gemmes som .npy filer i en mappe og
+indlæses igen som memory-mappede arrays, så de ikke læses ind i hukommelsen før de bruges.
+Resultat kan pakkes ud som outputtet fra l_år, altså ventetider, fly_der_venter, over_lukketid = resultat.
+Halen af ventetiderne for hvert år, altså kvantilerne over alle fly og den største ventetid, findes med hale.
+"""
+
+
+import os
+import numpy as np
+import Lufthavns_parallel_module as lpm
+import Lufthavns_statistik_module as lstat
+
+
+class Resultat:
+    """
+    En simulering over flere år gemt i sammenhængende arrays.
+
+    Input
+    ventetider -> float64 array (år, dage) med den gennemsnitlige ventetid for fly som venter, nan for dage hvor intet fly venter.
+    fly_der_venter -> float64 array (år, dage) med brøkdelen af fly som venter.
+    over_lukketid -> int32 array (år, dage) med hvornår det sidste fly er landet i forhold til lukketid.
+    antal_fly -> int32 array (år, dage) med antallet af fly.
+    alle_ventetider -> int32 array med ventetiderne for alle fly som venter.
+    start -> int64 array med år*dage+1 indeks, hvor hver dag starter i alle_ventetider.
+
+    Eksempel
+    >>> r = Resultat(np.array([[10.0, np.nan]]), np.array([[0.5, 0.0]]), np.array([[-5, -9]]), np.array([[4, 2]]), np.array([5, 15]), np.array([0, 2, 2]))
+    >>> r.tom
+    array([[False,  True]])
+    >>> r.dag_ventetider(0, 0), r.gns('ventetider'), r.gns('fly_der_venter')
+    (array([ 5, 15], dtype=int32), array([10.]), array([0.25]))
+    >>> Resultat(np.array([[np.nan]]), np.array([[0.0]]), np.array([[-9]]), np.array([[2]]), np.array([]), np.array([0, 0])).gns('ventetider')
+    array([nan])
+    """
+
+    ARRAYS = ('ventetider', 'fly_der_venter', 'over_lukketid', 'antal_fly', 'alle_ventetider', 'start')
+
+    def __init__(self, ventetider, fly_der_venter, over_lukketid, antal_fly, alle_ventetider, start):
+        #asarray kopierer ikke, hvis typen allerede er rigtig, så memory-mappede arrays forbliver memory-mappede
+        self.ventetider = np.asarray(ventetider, dtype = np.float64)
+        self.fly_der_venter = np.asarray(fly_der_venter, dtype = np.float64)
+        self.over_lukketid = np.asarray(over_lukketid, dtype = np.int32)
+        self.antal_fly = np.asarray(antal_fly, dtype = np.int32)
+        self.alle_ventetider = np.asarray(alle_ventetider, dtype = np.int32)
+        self.start = np.asarray(start, dtype = np.int64)
+        self.tom = self.start[1:].reshape(self.ventetider.shape) == self.start[:-1].reshape(self.ventetider.shape)
+
+    def __iter__(self):
+        #giver samme udpakning som l_år
+        return iter((self.ventetider, self.fly_der_venter, self.over_lukketid))
+
+    @property
+    def shape(self):
+        return self.ventetider.shape
+
+    def dag_ventetider(self, i, d):
+        #ventetiderne for fly som venter på dag d i år i, som et view
+        j = i*self.shape[1] + d
+        return self.alle_ventetider[self.start[j]:self.start[j+1]]
+
+    def år_ventetider(self, i):
+        #ventetiderne for alle fly som venter i år i, som et view
+        return self.alle_ventetider[self.start[i*self.shape[1]]:self.start[(i+1)*self.shape[1]]]
+
+    def år(self, i):
+        #målingerne for år i som views, i samme rækkefølge som m_dage
+        return self.ventetider[i], self.fly_der_venter[i], self.over_lukketid[i]
+
+    def gns(self, måling):
+        #gennemsnittet for hvert år af en måling, hvor dage uden ventende fly ikke tæller med i ventetiderne
+        if måling == 'ventetider': #et år uden ventende fly giver nan
+            antal = np.sum(~self.tom, axis = 1)
+            return np.divide(np.sum(self.ventetider, axis = 1, where = ~self.tom), antal, out = np.full(len(antal), np.nan), where = antal > 0)
+        return np.mean(getattr(self, måling), axis = 1)
+
+    def hale(self):
+        """
+        Halen af ventetiderne for hvert år over alle fly, også dem som ikke venter, se Lufthavns_statistik_module.hale.
+        Ventetiderne for et år læses en gang, og kun de ventetider som skal bruges findes med np.partition.
+
+        Output
+        et struktureret array med et element for hvert år og felterne p50, p90, p95, p99, max og over_lukketid_max.
+
+        Eksempel
+        >>> r = Resultat(np.array([[10.0, np.nan]]), np.array([[0.5, 0.0]]), np.array([[-5, -9]]), np.array([[4, 2]]), np.array([5, 15]), np.array([0, 2, 2]))
+        >>> r.hale()[0].tolist()
+        (0.0, 15.0, 15.0, 15.0, 15.0, -5.0)
+        """
+
+        navne = lstat.HALE_NAVNE + ('over_lukketid_max',)
+        svar = np.empty(self.shape[0], dtype = [(navn, np.float64) for navn in navne])
+        for i in range(self.shape[0]):
+            svar[i] = (*lstat.hale(self.år_ventetider(i), np.sum(self.antal_fly[i], dtype = np.int64)), np.max(self.over_lukketid[i]))
+        return svar
+
+    def ikke_tomme(self, i):
+        #de daglige ventetider i år i for dage hvor mindst et fly venter
+        return self.ventetider[i][~self.tom[i]]
+
+    def til_arrays(self):
+        #arrays som kan gemmes, bruges også af Lufthavns_cache_module
+        return {navn: getattr(self, navn) for navn in self.ARRAYS}
+
+    @classmethod
+    def fra_arrays(cls, arrays):
+        return cls(*(arrays[navn] for navn in cls.ARRAYS))
+
+    def gem(self, mappe):
+        """
+        Gemmer resultatet som en .npy fil for hvert array i mappen.
+        """
+
+        os.makedirs(mappe, exist_ok = True)
+        for navn, array in self.til_arrays().items():
+            np.save(os.path.join(mappe, navn + '.npy'), array)
+
+    @classmethod
+    def indlæs(cls, mappe, mmap_mode='r'):
+        """
+        Indlæser et resultat gemt med gem. Med mmap_mode = 'r' er arrays memory-mappede og læses først når de bruges.
+        """
+
+        return cls(*(np.load(os.path.join(mappe, navn + '.npy'), mmap_mode = mmap_mode) for navn in cls.ARRAYS))
+
+
+def l_år_resultat(l,m,n,k=1,seed=1,workers=None,bid=25,backend=None,vækst=1.05,intensitet=None):
+    """
+    Simulerer l år i lufthavnen med k landingsbaner og samler resultatet i et Resultat.
+    Opgaverne køres med Lufthavns_parallel_module.kør_opgaver ligesom i l_år_parallel, så målingerne er de samme.
+
+    Input
+    l, m, n, k -> som i l_år_k.
+    seed, workers, bid, backend, vækst, intensitet -> som i Lufthavns_parallel_module.sweep_parallel.
+
+    Output
+    resultat -> et Resultat med l+1 år og m dage.
+
+    Eksempel
+    >>> r = l_år_resultat(1, 10, 200, workers = 1)
+    >>> r.shape, bool(len(r.alle_ventetider) == r.start[-1]), r.ventetider.flags['C_CONTIGUOUS']
+    ((2, 10), True, True)
+    """
+
+    svar = lpm.kør_opgaver(lpm.opgaver(l, m, n, k, seed, bid, backend, vækst, intensitet), workers)
+
+    dage = np.concatenate([bid_dage for bid_dage, bid_ventetider in svar]).reshape(l+1, m, 4) #opgaverne er sorteret efter år og dag
+    ventetider = [vt for bid_dage, bid_ventetider in svar for vt in bid_ventetider]
+    start = np.concatenate(([0], np.cumsum([len(vt) for vt in ventetider])))
+    alle_ventetider = np.concatenate(ventetider) if ventetider else np.empty(0, dtype = np.int32)
+
+    return Resultat(*(np.ascontiguousarray(dage[:,:,j]) for j in range(4)), alle_ventetider, start) #kolonner som ikke holder dage i live
+
+
+
+if  __name__ == '__main__':
+   import doctest
+   print(doctest.testmod())
@@ -0,0 +1,231 @@
+"""
+@author: Mikkel Hviid Thorn og Rebekka Engelund Balle
+
+
+Information
+Modulet simulerer et gitter af scenarier til kapacitetsplanlægning.
+Et scenarie er en kombination af
+- n -> den gennemsnitlige mængde fly i år 0,
+- k -> antallet af landingsbaner,
+- vækst -> faktoren som flytrafikken vokser med hvert år,
+- fordeling -> navnet på vægtene eller fordelingen som landingstiderne trækkes efter, se Lufthavns_simulation_module.fly,
+og hvert scenarie giver en række for hvert af årene 0 til år.
+
+Planen:
+- Hver række svarer til en celle (n_år, k, fordeling), hvor n_år = int(n*vækst**år). Rækker med samme celle simuleres
+  kun en gang, fx når int(n*1.05**i) er det samme i to år, eller når to scenarier når samme n_år.
+- Celler med samme trafik (n_år, fordeling) simuleres i samme opgave på de samme dage for alle antal landingsbaner,
+  så forskellen mellem antal landingsbaner ikke indeholder støjen fra forskellige dage.
+- Opgaverne køres i en ProcessPoolExecutor som i Lufthavns_parallel_module. Generatoren for en opgave dannes fra
+  seed og trafikken i opgaven, så en celle giver det samme resultat uanset hvilket gitter den er en del af.
+
+Resultatet er et numpy struktureret array med en række per scenarie og år, se FELTER.
+
+
+Ordbog
+- m er antallet af dage simuleret i hver celle.
+- timer er antallet af timer lufthavnen er åben, og over_lukketid regnes i forhold til lukketiden efter timer.
+- ventetid er gennemsnittet over dagene af den gennemsnitlige ventetid for fly som venter, ligesom ventetider i
+  Lufthavns_simulation_module, og ventetid_se er standardfejlen på det gennemsnit.
+"""
+
+
+import os
+import zlib
+import itertools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+import Lufthavns_backend_module as lbm
+import Lufthavns_simulation_module as lsm
+import Lufthavns_fordeling_module as lf
+
+
+FELTER = [('n', np.int64), ('k', np.int64), ('vækst', np.float64), ('fordeling', 'U32'), ('år', np.int64),
+          ('n_år', np.int64), ('timer', np.float64), ('dage', np.int64), ('ventetid', np.float64),
+          ('ventetid_se', np.float64), ('fly_der_venter', np.float64), ('over_lukketid', np.float64)]
+RESULTATER = ('ventetid', 'ventetid_se', 'fly_der_venter', 'over_lukketid')
+
+
+"""
+Første sektion indeholder planen for gitteret.
+"""
+
+
+def planlæg(n, k, vækst=1.05, fordelinger=None, år=10, timer=13):
+    """
+    Planlægger det kartesiske produkt af scenarierne og finder de forskellige celler, som skal simuleres.
+
+    Input
+    n -> en eller flere gennemsnitlige mængder fly i år 0.
+    k -> et eller flere antal landingsbaner.
+    vækst -> en eller flere vækstfaktorer.
+    fordelinger -> en dictionary med navn og vægte for hver fordeling af landingstiderne. I stedet for vægte kan værdien
+    være en LandingTimeDistribution eller GrupperetFordeling fra Lufthavns_fordeling_module, fx estimeret fra målte data.
+    Hvis den er None bruges LANDINGSVÆGTE under navnet 'standard'.
+    år -> det sidste år, så hvert scenarie har år+1 rækker.
+    timer -> antallet af timer lufthavnen er åben.
+
+    Output
+    tabel -> et struktureret array med felterne i FELTER, hvor resultaterne er nan.
+    celler -> en liste med de forskellige (n_år, k, fordeling), som skal simuleres.
+    celle -> et array med indekset i celler for hver række i tabel.
+
+    Eksempel
+    >>> tabel, celler, celle = planlæg(10, (1, 2), vækst = 1.05, år = 3)
+    >>> len(tabel), len(celler), tabel['n_år'][:4].tolist(), celle[:4].tolist()
+    (8, 4, [10, 10, 11, 11], [0, 0, 2, 2])
+    """
+
+    fordelinger = {'standard': lsm.LANDINGSVÆGTE} if fordelinger is None else fordelinger
+    længde = np.dtype(FELTER)['fordeling'].itemsize//4 #det største antal tegn i navnet på en fordeling
+    for navn in fordelinger:
+        if not isinstance(navn, str) or len(navn) > længde:
+            raise ValueError(f'navnet på en fordeling skal være en tekst på højst {længde} tegn, ikke {navn!r}')
+    kombinationer = list(itertools.product(np.atleast_1d(n).tolist(), np.atleast_1d(k).tolist(),
+                                           np.atleast_1d(vækst).tolist(), list(fordelinger), range(år+1)))
+
+    tabel = np.zeros(len(kombinationer), dtype = FELTER)
+    for felt, værdier in zip(('n', 'k', 'vækst', 'fordeling', 'år'), zip(*kombinationer)):
+        tabel[felt] = værdier
+    tabel['n_år'] = [int(n_0*v**i) for n_0, k_0, v, f, i in kombinationer] #samme udregning som i l_år_k
+    tabel['timer'] = timer
+    for felt in RESULTATER:
+        tabel[felt] = np.nan
+
+    nøgler = list(zip(tabel['n_år'].tolist(), tabel['k'].tolist(), tabel['fordeling'].tolist()))
+    celler = sorted(set(nøgler))
+    indeks = {nøgle: i for i, nøgle in enumerate(celler)}
+
+    return tabel, celler, np.array([indeks[nøgle] for nøgle in nøgler], dtype = np.int64)
+
+
+"""
+Anden sektion indeholder simuleringen af cellerne.
+"""
+
+
+def _fingeraftryk(fordeling):
+    #et tal som kun afhænger af fordelingen af landingstiderne, så den samme fordeling altid giver den samme generator
+    if isinstance(fordeling, lf.GrupperetFordeling):
+        dele = [repr(fordeling.time_bredde), repr(None if fordeling.standard is None else _fingeraftryk(fordeling.standard))]
+        dele += [f'{gruppe!r}:{_fingeraftryk(f)}' for gruppe, f in sorted(fordeling.fordelinger.items(), key = lambda x: repr(x[0]))]
+        return zlib.crc32(';'.join(dele).encode())
+    if isinstance(fordeling, lf.LandingTimeDistribution):
+        return zlib.crc32(fordeling.værdier.astype(np.int64).tobytes() + fordeling.p.tobytes())
+    return zlib.crc32(np.asarray(fordeling, dtype = np.float64).tobytes()) #vægte som i fly, også når de ikke er hele tal
+
+
+def _kør_opgave(opgave):
+    #simulerer m dage med samme trafik for hvert antal landingsbaner og giver resultaterne for hver af dem
+    n_år, ks, fordeling, timer, m, seed, nøgle, backend = opgave
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key = nøgle))
+    if isinstance(fordeling, (lf.LandingTimeDistribution, lf.GrupperetFordeling)):
+        vægte = lsm.LANDINGSVÆGTE
+    else:
+        vægte, fordeling = fordeling, None
+
+    målinger = np.full((len(ks), m, 3), np.nan)
+    for d in range(m):
+        fly_liste = lsm.fly(n_år, rng, timer, vægte, fordeling)
+        if len(fly_liste) == 0:
+            målinger[:,d,2] = -timer*60*60
+            continue
+        for j, k in enumerate(ks): #de samme fly for alle antal landingsbaner
+            ventetider, LB = lbm.kø_k(fly_liste[:,0], fly_liste[:,1], k, backend)
+            målinger[j,d] = np.mean(ventetider) if ventetider else np.nan, len(ventetider)/len(fly_liste), LB - timer*60*60
+
+    resultater = []
+    for j in range(len(ks)):
+        ventetider = målinger[j,:,0][np.isfinite(målinger[j,:,0])] #dage uden ventende fly tæller ikke med
+        se = np.std(ventetider, ddof = 1)/np.sqrt(len(ventetider)) if len(ventetider) > 1 else np.nan
+        resultater.append((np.mean(ventetider) if len(ventetider) > 0 else np.nan, se,
+                           np.nanmean(målinger[j,:,1]) if np.any(np.isfinite(målinger[j,:,1])) else np.nan,
+                           np.mean(målinger[j,:,2])))
+    return resultater
+
+
+def kør(tabel, celler, celle, m, seed=1, workers=None, backend=None, fordelinger=None):
+    """
+    Simulerer cellerne fra planlæg og fylder resultaterne ind i tabellen.
+
+    Input
+    tabel, celler, celle -> outputtet fra planlæg.
+    m -> antallet af dage simuleret i hver celle.
+    seed -> seed til SeedSequence, som alle generatorer dannes fra.
+    workers -> antallet af processer. Med workers = 1 køres opgaverne i denne proces.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    fordelinger -> de samme fordelinger som i planlæg.
+
+    Output
+    tabel -> tabellen med resultaterne udfyldt.
+    """
+
+    fordelinger = {'standard': lsm.LANDINGSVÆGTE} if fordelinger is None else fordelinger
+    timer = float(tabel['timer'][0]) if len(tabel) > 0 else 13.0
+
+    trafik = {} #antallene af landingsbaner for hver trafik
+    for n_år, k, fordeling in celler:
+        trafik.setdefault((n_år, fordeling), []).append(k)
+
+    opgaver = []
+    for (n_år, fordeling), ks in trafik.items():
+        nøgle = (n_år, int(timer*60*60), _fingeraftryk(fordelinger[fordeling]))
+        opgaver.append((n_år, ks, fordelinger[fordeling], timer, m, seed, nøgle, backend))
+
+    if workers == 1:
+        svar = list(map(_kør_opgave, opgaver))
+    else:
+        with ProcessPoolExecutor(workers or os.cpu_count()) as pool:
+            svar = list(pool.map(_kør_opgave, opgaver, chunksize = max(1, len(opgaver)//(4*(workers or os.cpu_count())))))
+
+    resultater = np.empty((len(celler), len(RESULTATER)))
+    indeks = {c: i for i, c in enumerate(celler)}
+    for (n_år, fordeling), ks, opgave_svar in zip(trafik, trafik.values(), svar): #opgaverne er i samme rækkefølge som trafik
+        for k, resultat in zip(ks, opgave_svar):
+            resultater[indeks[(n_år, k, fordeling)]] = resultat
+
+    for i, felt in enumerate(RESULTATER):
+        tabel[felt] = resultater[celle, i]
+    tabel['dage'] = m
+
+    return tabel
+
+
+def sweep(n, k, vækst=1.05, fordelinger=None, år=10, m=100, timer=13, seed=1, workers=None, backend=None):
+    """
+    Planlægger og simulerer et gitter af scenarier.
+
+    Input
+    n, k, vækst, fordelinger, år, timer -> som i planlæg.
+    m, seed, workers, backend -> som i kør.
+
+    Output
+    tabel -> et struktureret array med felterne i FELTER og en række for hvert scenarie og år.
+
+    Eksempel
+    >>> tabel = sweep((50, 100), (1, 2), vækst = (1.05, 1.1), år = 2, m = 5, workers = 1)
+    >>> len(tabel), tabel.dtype.names[:5], bool(np.all(tabel['fly_der_venter'][tabel['k'] == 2] <= tabel['fly_der_venter'][tabel['k'] == 1]))
+    (24, ('n', 'k', 'vækst', 'fordeling', 'år'), True)
+    >>> målt = lf.LandingTimeDistribution([60, 90, 120], [1, 2, 1])
+    >>> tabel = sweep(100, 1, fordelinger = {'standard': lsm.LANDINGSVÆGTE, 'målt': målt}, år = 1, m = 5, workers = 1)
+    >>> tabel['fordeling'].tolist(), bool(np.all(tabel['fly_der_venter'][tabel['fordeling'] == 'målt'] < tabel['fly_der_venter'][tabel['fordeling'] == 'standard']))
+    (['standard', 'standard', 'målt', 'målt'], True)
+    """
+
+    tabel, celler, celle = planlæg(n, k, vækst, fordelinger, år, timer)
+    return kør(tabel, celler, celle, m, seed, workers, backend, fordelinger)
+
+
+def til_dataframe(tabel):
+    """
+    Omdanner en tabel fra sweep til en pandas DataFrame. Kræver at pandas er installeret.
+    """
+
+    import pandas as pd
+    return pd.DataFrame(tabel)
+
+
+
+if  __name__ == '__main__':
+   import doctest
+   print(doctest.testmod())
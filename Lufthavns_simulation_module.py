@@ -21,6 +21,8 @@ Ordbog
 - f og fly står for flyene
 - l, m, n er diskrete antal
 - LB står for landingsbane
+- k er antallet af landingsbaner
+- rng er en numpy.random.Generator, som alle funktioner kan tage. Uden rng bruges den globale tilstand fra npr.seed(1).
 - ventetider er tiden et fly skal vente før det kan lande, hvor tiden kun tælles, hvis den er forskelligt for nul.
 - fly_der_venter er brøkdelen af fly som venter.
 - over_lukketid er den tid, hvor sidste fly er landet, relativt til de 13 timer.
@@ -32,18 +34,26 @@ Data som simuleringen danner
 """
 
 
+import os
+import heapq
+from functools import lru_cache
 import numpy as np
 import numpy.random as npr
+import Lufthavns_backend_module as lbm
+import Lufthavns_statistik_module as lstat
 
 npr.seed(1)
 
 
+LANDINGSVÆGTE = [16, 33, 61, 41, 25, 10, 8, 6] #observerede antal landinger ud af 200 i hver kategori på 30 sekunder
+
+
 """
 Første sektion indeholder en funktion, som danner fly.
 """
 
 
-def fly(n):
+def fly(n,rng=None,timer=13,vægte=LANDINGSVÆGTE,fordeling=None,intensitet=None):
     """
     Danner x fly, hvor x er en stokatisk variabel for en poisson fordeling med lambda = n.
     Hvert fly er en liste med en ankomsttid i første index og landingstid i andet index.
@@ -51,6 +61,12 @@ def fly(n):
 
     Input
     n -> er lambda værdien i vores poisson fordeling. Det skal symbolisere den gennemsnitlige mængde fly.
+    rng -> en numpy.random.Generator som flyene trækkes fra. Hvis den er None bruges den globale tilstand i numpy.random.
+    timer -> antallet af timer lufthavnen er åben, hvor flyene ankommer.
+    vægte -> antallet af observerede landinger i hver kategori på 30 sekunder, som landingstiderne trækkes efter.
+    Vægtene kan også være sandsynligheder eller andre ikke-negative tal, de normaliseres med deres sum.
+    fordeling -> en fordeling af landingstiderne fra Lufthavns_fordeling_module, som bruges i stedet for vægte, eller None.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se _ankomsttider. Med None er de uniforme.
 
     Output
     f -> en liste af x fly.
@@ -63,31 +79,227 @@ def fly(n):
     >>> fly(3)
     array([[ 1003,   101],
            [29724,   138]])
-    """
     
-    x = npr.poisson(n) #antal fly
+    >>> fly(3, np.random.default_rng(1))
+    array([[12784,   102],
+           [19811,   115],
+           [38736,   143],
+           [40670,   117]])
+    
+    >>> f = fly(200, np.random.default_rng(1), intensitet = [3, 1, 1, 1, 1, 1, 0, 1, 1, 1, 1, 1, 3])
+    >>> len(f), int(np.count_nonzero(f[:,0] < 3600)), int(np.count_nonzero((6*3600 <= f[:,0]) & (f[:,0] < 7*3600)))
+    (200, 28, 0)
+    
+    >>> f = fly(1000, np.random.default_rng(1), vægte = [0.25, 0.75])
+    >>> np.bincount((f[:,1]-31)//30).tolist(), int(f[:,1].min()) >= 31, int(f[:,1].max()) <= 89
+    ([241, 760], True, True)
+    """
     
-    ankomsttider = np.sort(npr.randint(0, 13*60*60, size = x)) #liste med ankomsttider
+    if rng is None: #flyene trækkes fra den globale tilstand i numpy.random
+        x = npr.poisson(n) #antal fly
+        
+        ankomsttider = _sorter(_ankomsttider(x, npr.randint, npr.random, timer, intensitet)) #liste med ankomsttider
+        
+        #liste med landingstider, hvor landingstiden i hver kategori trækkes for alle fly på en gang
+        if fordeling is None:
+            kategorier = npr.choice(np.arange(len(vægte)), size = x, p = np.array(vægte)/np.sum(vægte))
+            landingstider = npr.randint(kategorier*30+31, (kategorier+2)*30)
+        else:
+            landingstider = fordeling.landingstider(ankomsttider)
     
-    #liste med landingstider
-    landingstider = npr.choice(np.arange(8), size = x, p = [16/200, 33/200, 61/200, 41/200, 25/200, 10/200, 8/200, 6/200])
-    landingstider = [npr.randint(i*30+31, (i+2)*30) for i in landingstider]
+    else: #flyene trækkes fra en selvstændig generator
+        x = rng.poisson(n) #antal fly
+        ankomsttider = _sorter(_ankomsttider(x, rng.integers, rng.random, timer, intensitet)) #liste med ankomsttider
+        if fordeling is None:
+            landingstider = _træk_landingstider(x, rng, vægte) #liste med landingstider
+        else:
+            landingstider = fordeling.landingstider(ankomsttider, rng)
     
     f = np.transpose([ankomsttider,landingstider]) #liste med fly
     return f
 
 
+def _ankomsttider(x, heltal, uniform, timer=13, intensitet=None):
+    """
+    Trækker x usorterede ankomsttider i hele sekunder fra 0 til timer*60*60 med den inverse fordelingsfunktion.
+    Antallet af fly er stadig poisson fordelt med lambda = n, så intensiteten bestemmer kun hvornår på dagen flyene kommer.
+
+    Input
+    x -> antallet af fly.
+    heltal, uniform -> funktioner som trækker uniforme heltal og uniforme tal, fx rng.integers og rng.random.
+    timer -> antallet af timer lufthavnen er åben.
+    intensitet -> en af
+    - None, så ankomsterne er uniforme.
+    - en relativ intensitet for hver time, altså et tal for hver af de timer lufthavnen er åben. Timen trækkes fra de
+      kumulative vægte, og sekundet i timen er uniformt.
+    - en funktion af tiden i sekunder, som giver den relative intensitet for et array af tider. Den udregnes en gang for
+      hvert sekund på dagen, og sekundet trækkes fra de kumulative værdier.
+    """
+
+    T = int(timer*60*60)
+    if intensitet is None:
+        return heltal(0, T, size = x)
+
+    if callable(intensitet):
+        cdf = _sekund_cdf(intensitet, T)
+        return np.minimum(np.searchsorted(cdf, uniform(x), side = 'right'), T-1)
+
+    vægte = np.asarray(intensitet, dtype = np.float64)
+    if len(vægte) != int(np.ceil(timer)) or np.any(vægte < 0) or np.sum(vægte) <= 0:
+        raise ValueError(f'intensiteten skal have en ikke-negativ vægt for hver af de {int(np.ceil(timer))} timer og en positiv sum')
+    cdf = np.cumsum(vægte)/np.sum(vægte)
+    time = np.minimum(np.searchsorted(cdf, uniform(x), side = 'right'), len(vægte)-1)
+    return np.minimum(time*60*60 + heltal(0, 60*60, size = x), T-1)
+
+
+@lru_cache(maxsize = 16) #intensiteten udregnes kun en gang for hvert sekund, og ikke for hver dag
+def _sekund_cdf(intensitet, T):
+    #den kumulative fordeling af ankomsttiden over dagens sekunder for en intensitet, som er en funktion af tiden
+    værdier = np.broadcast_to(np.asarray(intensitet(np.arange(T)), dtype = np.float64), (T,))
+    if np.any(værdier < 0) or np.sum(værdier) <= 0:
+        raise ValueError('intensiteten skal være ikke-negativ med en positiv sum')
+    return np.cumsum(værdier)/np.sum(værdier)
+
+
+def _sorter(ankomsttider):
+    #sorteringen er en funktion for sig, så Lufthavns_profil_module kan måle den adskilt fra resten af fly
+    return np.sort(ankomsttider)
+
+
+def _træk_landingstider(x, rng, vægte=LANDINGSVÆGTE):
+    #landingstider til x fly fra rng. Vægte som er hele tal giver kategorien og landingstiden fra et enkelt træk, se _landingstider,
+    #ellers trækkes kategorien med sandsynlighederne vægte/sum(vægte) og landingstiden uniformt i kategoriens interval
+    v = np.asarray(vægte, dtype = np.float64)
+    if len(v) == 0 or np.any(v < 0) or np.sum(v) <= 0:
+        raise ValueError('vægtene skal være ikke-negative med en positiv sum')
+    if np.all(v == np.round(v)):
+        return _landingstider(rng.integers(0, int(np.sum(v))*29, size = x), v.astype(np.int64))
+    kategorier = rng.choice(len(v), size = x, p = v/np.sum(v))
+    return kategorier*30+31 + rng.integers(0, 29, size = x)
+
+
+def _landingstider(r, vægte=LANDINGSVÆGTE):
+    #vægtene er hele tal ud af sum(vægte), så et uniformt heltal r i [0, sum(vægte)*29) bestemmer både kategorien og landingstiden i kategoriens interval
+    kategorier = np.repeat(np.arange(len(vægte)), vægte)[r // 29]
+    return kategorier*30+31 + r % 29
+
+
+"""
+Anden sektion indeholder funktioner, som simulerer lufthavnen med k landingsbaner.
+Funktionerne med en og to landingsbaner bruger disse funktioner.
+"""
+
+
+def en_dag_k(n,k,backend=None,rng=None,fordeling=None,intensitet=None):
+    """
+    Simulerer en dag i lufthavnen med k landingsbaner. Funktionen arbejder med en liste fly.
+    Tidspunkterne hvor landingsbanerne er fri gemmes i en min-heap, så hvert fly koster O(log k).
+
+    Input
+    n -> skal symbolisere den gennemsnitlige mængde fly.
+    k -> antallet af landingsbaner.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly.
+    fordeling -> en fordeling af landingstiderne fra Lufthavns_fordeling_module eller None, se fly.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se _ankomsttider.
+
+    Output
+    ventetider -> en liste med ventetiderne for alle fly, som skal vente med at lande.
+    len(ventetider)/len(fly_liste) -> brøkdelen af fly, som skal vente med at lande.
+    LB - 13*60*60 -> hvornår det sidste fly er landet i forhold til lukketid.
+    """
+    
+    fly_liste = fly(n,rng,fordeling=fordeling,intensitet=intensitet) #setup
+    
+    #simulerer en dag ved at tjekke status på lufthavnen hver gang et fly ankommer, LB er den landingsbane som lukker sidst
+    ventetider, LB = lbm.kø_k(fly_liste[:,0], fly_liste[:,1], k, backend)
+    
+    return ventetider, len(ventetider)/len(fly_liste), LB - 13*60*60
+
+
+def m_dage_k(m,n,k,backend=None,rng=None,fordeling=None,intensitet=None):
+    """
+    Simulerer m dage i lufthavnen med k landingsbaner. 
+    Funktionen gentager en_dag_k funktionen m gange.
+
+    Input
+    m -> antallet af dage simuleret.
+    n -> skal symbolisere den gennemsnitlige mængde fly.
+    k -> antallet af landingsbaner.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly.
+    fordeling -> en fordeling af landingstiderne fra Lufthavns_fordeling_module eller None, se fly.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se _ankomsttider.
+
+    Output
+    liste_mean_ventetider -> en liste med gennemsnitlig ventetid for alle fly, som skal vente med at lande, hver dag.
+    liste_fly_der_venter -> en liste over brøkdelen af fly, som skal vente med at lande, hver dag.
+    liste_over_lukketid -> en liste over hvornår det sidste fly er landet i forhold til lukketid hver dag.
+    """
+    
+    liste_ventetider, liste_fly_der_venter, liste_over_lukketid = [], [], [] #setup
+    
+    for i in range(0,m): #gentager simuleringen i en_dag_k funktionen m gange
+        ventetider, fly_der_venter, over_lukketid = en_dag_k(n,k,backend,rng,fordeling,intensitet)
+        liste_ventetider.append(ventetider)
+        liste_fly_der_venter.append(fly_der_venter)
+        liste_over_lukketid.append(over_lukketid)
+    
+    liste_mean_ventetider = [np.mean(vt) for vt in liste_ventetider] #tager den gennemsnitlige ventetid for hver dag
+    
+    return liste_mean_ventetider, liste_fly_der_venter, liste_over_lukketid
+
+
+def l_år_k(l,m,n,k,backend=None,rng=None,vækst=1.05,fordeling=None,intensitet=None):
+    """
+    Simulerer l år i lufthavnen med k landingsbaner.
+    Funktionen gentager m_dage_k funktionen l gange, hvor det gennemsnitlige antal fly stiger for hver iteration.
+    Stigningen er på 5% hvert år som standard og udregnes med renteformlen.
+
+    Input
+    l -> antallet af år simuleret.
+    m -> antallet af dage simuleret.
+    n -> skal symbolisere den gennemsnitlige mængde fly.
+    k -> antallet af landingsbaner.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly.
+    vækst -> faktoren som flytrafikken vokser med hvert år.
+    fordeling -> en fordeling af landingstiderne fra Lufthavns_fordeling_module eller None, se fly.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se _ankomsttider.
+
+    Output
+    liste_ventetider -> en liste med gennemsnitlig ventetid for alle fly, som skal vente med at lande, hver dag for l år.
+    liste_fly_der_venter -> en liste over brøkdelen af fly, som skal vente med at lande, hver dag for l år.
+    liste_over_lukketid -> en liste over hvornår det sidste fly er landet i forhold til lukketid hver dag for l år.
+    """
+    
+    liste_ventetider, liste_fly_der_venter, liste_over_lukketid = [], [], [] #setup
+    
+    for i in range(0,l+1): #gentager simuleringen i m_dage_k funktionen l gange
+         ventetider, fly_der_venter, over_lukketid = m_dage_k(m,int(n*vækst**i),k,backend,rng,fordeling,intensitet)
+         liste_ventetider.append(ventetider)
+         liste_fly_der_venter.append(fly_der_venter)
+         liste_over_lukketid.append(over_lukketid)
+         
+    return liste_ventetider, liste_fly_der_venter, liste_over_lukketid
+
+
 """
-Anden sektion indeholder funktioner, som simulerer lufthavnen med en landingsbane.
+Tredje sektion indeholder funktioner, som simulerer lufthavnen med en landingsbane.
 """
 
 
-def en_dag(n):
+def en_dag(n,backend=None,rng=None,fordeling=None,intensitet=None):
     """
     Simulerer en dag i lufthavnen. Funktionen arbejder med en liste fly.
+    Funktionen kalder en_dag_k med en landingsbane.
 
     Input
     n -> skal symbolisere den gennemsnitlige mængde fly.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly.
+    fordeling -> en fordeling af landingstiderne fra Lufthavns_fordeling_module eller None, se fly.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se _ankomsttider.
 
     Output
     ventetider -> en liste med ventetiderne for alle fly, som skal vente med at lande.
@@ -102,27 +314,21 @@ def en_dag(n):
     ([1, 43, 57], 0.07142857142857142, -70)
     """
     
-    fly_liste = fly(n) #setup
-    LB, ventetider = 0, []
-    
-    for f in fly_liste: #simulerer en dag ved at tjekke status på lufthavnen hver gang et fly ankommer
-        if f[0] < LB: #landingsbanen er optaget
-            ventetider.append(LB-f[0])
-            LB += f[1]
-        else: #landingsbanen er fri
-            LB = np.sum(f)
-            
-    return ventetider, len(ventetider)/len(fly_liste), LB - 13*60*60
+    return en_dag_k(n,1,backend,rng,fordeling,intensitet)
 
 
-def m_dage(m,n):
+def m_dage(m,n,backend=None,rng=None,fordeling=None,intensitet=None):
     """
     Simulerer m dage i lufthavnen. 
-    Funktionen gentager en_dag funktionen m gange.
+    Funktionen gentager en_dag funktionen m gange ved at kalde m_dage_k med en landingsbane.
 
     Input
     m -> antallet af dage simuleret.
     n -> skal symbolisere den gennemsnitlige mængde fly.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly.
+    fordeling -> en fordeling af landingstiderne fra Lufthavns_fordeling_module eller None, se fly.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se _ankomsttider.
 
     Output
     liste_mean_ventetider -> en liste med gennemsnitlig ventetid for alle fly, som skal vente med at lande, hver dag.
@@ -137,30 +343,25 @@ def m_dage(m,n):
     ([92.66666666666667, 72.0, 94.5], [0.13043478260869565, 0.10638297872340426, 0.0392156862745098], [-771, 26, -568])
     """
     
-    liste_ventetider, liste_fly_der_venter, liste_over_lukketid = [], [], [] #setup
-    
-    for i in range(0,m): #gentager simuleringen i en_dag funktionen m gange
-        ventetider, fly_der_venter, over_lukketid = en_dag(n)
-        liste_ventetider.append(ventetider)
-        liste_fly_der_venter.append(fly_der_venter)
-        liste_over_lukketid.append(over_lukketid)
-    
-    liste_mean_ventetider = [np.mean(vt) for vt in liste_ventetider] #tager den gennemsnitlige ventetid for hver dag
-    
-    return liste_mean_ventetider, liste_fly_der_venter, liste_over_lukketid
+    return m_dage_k(m,n,1,backend,rng,fordeling,intensitet)
 
 
-def l_år(l,m,n):
+def l_år(l,m,n,backend=None,rng=None,vækst=1.05,fordeling=None,intensitet=None):
     """
-    Simulerer l år i lufthavnen.
+    Simulerer l år i lufthavnen ved at kalde l_år_k med en landingsbane.
     Funktionen gentager m_dage funktionen l gange, hvor det gennemsnitlige antal fly stiger for hver iteration.
-    Stigningen er på 5% hvert år og udregnes med renteformlen.
+    Stigningen er på 5% hvert år som standard og udregnes med renteformlen.
     Outputtet er to todimensionelle lister.
 
     Input
     l -> antallet af år simuleret.
     m -> antallet af dage simuleret.
     n -> skal symbolisere den gennemsnitlige mængde fly.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly.
+    vækst -> faktoren som flytrafikken vokser med hvert år.
+    fordeling -> en fordeling af landingstiderne fra Lufthavns_fordeling_module eller None, se fly.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se _ankomsttider.
 
     Output
     liste_ventetider -> en liste med gennemsnitlig ventetid for alle fly, som skal vente med at lande, hver dag for l år.
@@ -175,28 +376,25 @@ def l_år(l,m,n):
     ([[127.9090909090909, 78.0, 76.75], [117.77777777777777, 47.0, 55.625], [105.5, 93.0, 33.666666666666664], [62.57142857142857, 75.28571428571429, 104.08333333333333]], [[0.21568627450980393, 0.15517241379310345, 0.1568627450980392], [0.15789473684210525, 0.16279069767441862, 0.17777777777777778], [0.12, 0.0392156862745098, 0.058823529411764705], [0.12280701754385964, 0.12727272727272726, 0.18461538461538463]], [[-138, 131, -1806], [-21, -25, -309], [-283, -765, -250], [-509, -839, 160]])
     """
     
-    liste_ventetider, liste_fly_der_venter, liste_over_lukketid = [], [], [] #setup
-    
-    for i in range(0,l+1): #gentager simuleringen i m_dage funktionen l gange
-         ventetider, fly_der_venter, over_lukketid = m_dage(m,int(n*(1.05)**i))
-         liste_ventetider.append(ventetider)
-         liste_fly_der_venter.append(fly_der_venter)
-         liste_over_lukketid.append(over_lukketid)
-         
-    return liste_ventetider, liste_fly_der_venter, liste_over_lukketid
+    return l_år_k(l,m,n,1,backend,rng,vækst,fordeling,intensitet)
 
 
 """
-Tredje sektion indeholder funktioner, som simulerer lufthavnen med to landingsbaner.
+Fjerde sektion indeholder funktioner, som simulerer lufthavnen med to landingsbaner.
 """
 
 
-def en_dag_2LB(n):
+def en_dag_2LB(n,backend=None,rng=None,fordeling=None,intensitet=None):
     """
     Simulerer en dag i lufthavnen med to landingsbaner. Funktionen arbejder med en liste fly.
+    Funktionen kalder en_dag_k med to landingsbaner.
 
     Input
     n -> skal symbolisere den gennemsnitlige mængde fly.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly.
+    fordeling -> en fordeling af landingstiderne fra Lufthavns_fordeling_module eller None, se fly.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se _ankomsttider.
 
     Output
     ventetider -> en liste med ventetiderne for alle fly, som skal vente med at lande.
@@ -211,40 +409,21 @@ def en_dag_2LB(n):
     ([21, 88, 9, 16, 6, 19], 0.05454545454545454, -116)
     """
     
-    fly_liste = fly(n) #setup
-    LB1, LB2, ventetider = 0, 0, []
-    
-    for f in fly_liste: #simulerer en dag ved at tjekke status på lufthavnen hver gang et fly ankommer
-        if f[0] < LB1: #tjekker om landingsbanerne er optaget
-            if f[0] < LB2:    
-                if LB1 <= LB2:
-                    ventetider.append(LB1-f[0])
-                    LB1 += f[1]
-                elif LB2 < LB1:
-                    ventetider.append(LB2-f[0])
-                    LB2 += f[1]
-                    
-            else: #landingsbaneren er ikke optaget
-                LB2 = np.sum(f)
-        else:
-            LB1 = np.sum(f)
-    
-    if LB2 < LB1: #finder den landingsbaner som lukker sidst
-        LB = LB1
-    else:
-        LB = LB2
-    
-    return ventetider, len(ventetider)/len(fly_liste), LB - 13*60*60
+    return en_dag_k(n,2,backend,rng,fordeling,intensitet)
 
 
-def m_dage_2LB(m,n):
+def m_dage_2LB(m,n,backend=None,rng=None,fordeling=None,intensitet=None):
     """
     Simulerer m dage i lufthavnen med to landingsbaner. 
-    Funktionen gentager en_dag funktionen m gange.
+    Funktionen gentager en_dag_2LB funktionen m gange ved at kalde m_dage_k med to landingsbaner.
 
     Input
     m -> antallet af dage simuleret.
     n -> skal symbolisere den gennemsnitlige mængde fly.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly.
+    fordeling -> en fordeling af landingstiderne fra Lufthavns_fordeling_module eller None, se fly.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se _ankomsttider.
 
     Output
     liste_mean_ventetider -> en liste med gennemsnitlig ventetid for alle fly, som skal vente med at lande, hver dag.
@@ -259,30 +438,25 @@ def m_dage_2LB(m,n):
     ([27.666666666666668, 46.833333333333336, 44.0], [0.05, 0.047244094488188976, 0.0410958904109589], [-311, -377, 200])
     """
     
-    liste_ventetider, liste_fly_der_venter, liste_over_lukketid, = [], [], [] #setup
-    
-    for i in range(0,m): #gentager simuleringen i en_dag funktionen m gange
-        ventetider, fly_der_venter, over_lukketid = en_dag_2LB(n)
-        liste_ventetider.append(ventetider)
-        liste_fly_der_venter.append(fly_der_venter)
-        liste_over_lukketid.append(over_lukketid)
-    
-    liste_mean_ventetider = [np.mean(vt) for vt in liste_ventetider] #tager den gennemsnitlige ventetid for hver dag
-    
-    return liste_mean_ventetider, liste_fly_der_venter, liste_over_lukketid
+    return m_dage_k(m,n,2,backend,rng,fordeling,intensitet)
 
 
-def l_år_2LB(l,m,n):
+def l_år_2LB(l,m,n,backend=None,rng=None,vækst=1.05,fordeling=None,intensitet=None):
     """
-    Simulerer l år i lufthavnen med to landingsbaner.
-    Funktionen gentager m_dage funktionen l gange, hvor det gennemsnitlige antal fly stiger for hver iteration.
-    Stigningen er på 5% hvert år og udregnes med renteformlen.
+    Simulerer l år i lufthavnen med to landingsbaner ved at kalde l_år_k.
+    Funktionen gentager m_dage_2LB funktionen l gange, hvor det gennemsnitlige antal fly stiger for hver iteration.
+    Stigningen er på 5% hvert år som standard og udregnes med renteformlen.
     Outputtet er to todimensionelle lister.
 
     Input
     l -> antallet af år simuleret.
     m -> antallet af dage simuleret.
     n -> skal symbolisere den gennemsnitlige mængde fly.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly.
+    vækst -> faktoren som flytrafikken vokser med hvert år.
+    fordeling -> en fordeling af landingstiderne fra Lufthavns_fordeling_module eller None, se fly.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se _ankomsttider.
 
     Output
     liste_ventetider -> en liste med gennemsnitlig ventetid for alle fly, som skal vente med at lande, hver dag for l år.
@@ -296,10 +470,142 @@ def l_år_2LB(l,m,n):
     >>> l_år_2LB(3,3,120)
     ([[66.0, 24.666666666666668, 56.285714285714285], [18.25, 76.85714285714286, 77.0], [57.75, 58.125, 40.857142857142854], [53.4, 49.09090909090909, 20.6]], [[0.018018018018018018, 0.024390243902439025, 0.051470588235294115], [0.031746031746031744, 0.050724637681159424, 0.04516129032258064], [0.057971014492753624, 0.06201550387596899, 0.04827586206896552], [0.04716981132075472, 0.07006369426751592, 0.037037037037037035]], [[-147, -12, 65], [-496, -99, -5], [-603, -725, -260], [175, -252, 48]])
     """
+    
+    return l_år_k(l,m,n,2,backend,rng,vækst,fordeling,intensitet)
+
+
+
+"""
+Femte sektion indeholder en vektoriseret udgave af simuleringen med en landingsbane, hvor alle dage simuleres på en gang.
+"""
+
+
+def fly_batch(m,n,rng=None,intensitet=None):
+    """
+    Danner fly til m dage på en gang. Hver dag har et poisson fordelt antal fly med lambda = n.
+    Dagene er polstret med nuller op til det største antal fly på en dag, så de kan gemmes i todimensionelle arrays.
+    Ankomsttiderne er sorteret for hver dag.
+
+    Input
+    m -> antallet af dage.
+    n -> er lambda værdien i vores poisson fordeling. Det skal symbolisere den gennemsnitlige mængde fly.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se _ankomsttider.
+
+    Output
+    ankomsttider -> et (m, x_max) array med ankomsttider, polstret med nuller.
+    landingstider -> et (m, x_max) array med landingstider, polstret med nuller.
+    antal -> et array med antallet af fly for hver dag.
+    """
+    
+    poisson, heltal, uniform = (npr.poisson, npr.randint, npr.random) if rng is None else (rng.poisson, rng.integers, rng.random)
+    
+    antal = poisson(n, size = m) #antal fly hver dag
+    x_max, total = np.max(antal, initial = 0), np.sum(antal)
+    
+    #samme fordelinger som i fly, men trukket for alle dage på en gang
+    ankomst = _ankomsttider(total, heltal, uniform, 13, intensitet)
+    landing = _landingstider(heltal(0, 200*29, size = total))
+    
+    maske = np.arange(x_max) < antal[:,None] #markerer de pladser i hver dag, som indeholder et fly
+    ankomsttider = np.full((m,x_max), 13*60*60)
+    ankomsttider[maske] = ankomst
+    ankomsttider = np.sort(ankomsttider, axis = 1) #polstringen havner bagerst, da den er større end alle ankomsttider
+    ankomsttider[~maske] = 0
+    landingstider = np.zeros((m,x_max), dtype = landing.dtype)
+    landingstider[maske] = landing
+    
+    return ankomsttider, landingstider, antal
+
+
+def en_dag_batch(ankomsttider, landingstider, antal):
+    """
+    Simulerer mange dage i lufthavnen med en landingsbane på en gang.
+    Landingsbanen er fri igen til tiden D_i = max(ankomst_i, D_(i-1)) + landingstid_i.
+    Rekursionen løses med kumulative summer, da D_i = C_i + max_(j<=i)(ankomst_j - C_(j-1)), hvor C er den kumulative sum af landingstiderne.
+
+    Input
+    ankomsttider -> et (m, x_max) array med sorterede ankomsttider, polstret med nuller.
+    landingstider -> et (m, x_max) array med landingstider, polstret med nuller.
+    antal -> et array med antallet af fly for hver dag.
+
+    Output
+    ventetider -> et (m, x_max) array med ventetiderne, hvor fly der ikke venter har ventetiden 0.
+    fly_der_venter -> et array med brøkdelen af fly, som skal vente med at lande, hver dag.
+    over_lukketid -> et array med hvornår det sidste fly er landet i forhold til lukketid hver dag.
+    
+    Eksempel
+    >>> ventetider, fly_der_venter, over_lukketid = en_dag_batch(np.array([[10, 20, 100], [5, 0, 0]]), np.array([[40, 40, 40], [50, 0, 0]]), np.array([3, 1]))
+    >>> ventetider
+    array([[ 0, 30,  0],
+           [ 0,  0,  0]])
+    >>> fly_der_venter, over_lukketid
+    (array([0.33333333, 0.        ]), array([-46660, -46745]))
+    """
+    
+    C = np.cumsum(landingstider, axis = 1, dtype = np.int64)
+    D = C + np.maximum.accumulate(ankomsttider - (C - landingstider), axis = 1) #tidspunkt hvor landingsbanen er fri efter hvert fly
+    LB_før = np.zeros_like(D) #tidspunkt hvor landingsbanen er fri, når hvert fly ankommer
+    LB_før[:,1:] = D[:,:-1]
+    
+    maske = np.arange(D.shape[1]) < antal[:,None]
+    ventetider = np.where(maske & (ankomsttider < LB_før), LB_før - ankomsttider, 0)
+    
+    LB = D[:,-1] if D.shape[1] > 0 else np.zeros(len(antal), dtype = np.int64) #polstringen ændrer ikke landingsbanen
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        fly_der_venter = np.count_nonzero(ventetider, axis = 1) / antal
+    
+    return ventetider, fly_der_venter, LB - 13*60*60
+
+
+def m_dage_batch(m,n,rng=None,intensitet=None):
+    """
+    Simulerer m dage i lufthavnen på en gang. 
+    Funktionen giver samme output som m_dage, men bruger fly_batch og en_dag_batch i stedet for en løkke over en_dag.
+
+    Input
+    m -> antallet af dage simuleret.
+    n -> skal symbolisere den gennemsnitlige mængde fly.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se _ankomsttider.
+
+    Output
+    liste_mean_ventetider -> en liste med gennemsnitlig ventetid for alle fly, som skal vente med at lande, hver dag.
+    liste_fly_der_venter -> en liste over brøkdelen af fly, som skal vente med at lande, hver dag.
+    liste_over_lukketid -> en liste over hvornår det sidste fly er landet i forhold til lukketid hver dag.
+    """
+    
+    ventetider, fly_der_venter, over_lukketid = en_dag_batch(*fly_batch(m,n,rng,intensitet))
+    
+    with np.errstate(invalid = 'ignore', divide = 'ignore'): #dage uden ventende fly giver nan ligesom np.mean([])
+        mean_ventetider = np.sum(ventetider, axis = 1) / np.count_nonzero(ventetider, axis = 1)
+    
+    return mean_ventetider.tolist(), fly_der_venter.tolist(), over_lukketid.tolist()
+
+
+def l_år_batch(l,m,n,rng=None,intensitet=None,vækst=1.05):
+    """
+    Simulerer l år i lufthavnen, hvor alle dage i et år simuleres på en gang.
+    Funktionen giver samme output som l_år, men bruger m_dage_batch i stedet for m_dage.
+
+    Input
+    l -> antallet af år simuleret.
+    m -> antallet af dage simuleret.
+    n -> skal symbolisere den gennemsnitlige mængde fly.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se _ankomsttider.
+    vækst -> faktoren som flytrafikken vokser med hvert år.
+
+    Output
+    liste_ventetider -> en liste med gennemsnitlig ventetid for alle fly, som skal vente med at lande, hver dag for l år.
+    liste_fly_der_venter -> en liste over brøkdelen af fly, som skal vente med at lande, hver dag for l år.
+    liste_over_lukketid -> en liste over hvornår det sidste fly er landet i forhold til lukketid hver dag for l år.
+    """
+    
     liste_ventetider, liste_fly_der_venter, liste_over_lukketid = [], [], [] #setup
     
-    for i in range(0,l+1): #gentager simuleringen i m_dage funktionen l gange
-         ventetider, fly_der_venter, over_lukketid = m_dage_2LB(m,int(n*(1.05)**i))
+    for i in range(0,l+1): #gentager simuleringen i m_dage_batch funktionen l gange
+         ventetider, fly_der_venter, over_lukketid = m_dage_batch(m,int(n*vækst**i),rng,intensitet)
          liste_ventetider.append(ventetider)
          liste_fly_der_venter.append(fly_der_venter)
          liste_over_lukketid.append(over_lukketid)
@@ -308,6 +614,287 @@ def l_år_2LB(l,m,n):
 
 
 
+"""
+Sjette sektion indeholder funktioner, som simulerer mange dage uden at gemme ventetiderne.
+Hver dag opdaterer en StrømStatistik fra Lufthavns_statistik_module, så hukommelsen ikke vokser med antallet af dage.
+"""
+
+
+def m_dage_strøm(m,n,k=1,backend=None,rng=None,statistik=None,intensitet=None):
+    """
+    Simulerer m dage i lufthavnen med k landingsbaner og opdaterer løbende statistik i stedet for at gemme ventetiderne.
+
+    Input
+    m -> antallet af dage simuleret.
+    n -> skal symbolisere den gennemsnitlige mængde fly.
+    k -> antallet af landingsbaner.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly.
+    statistik -> en StrømStatistik som opdateres. Hvis den er None dannes en ny.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se _ankomsttider.
+
+    Output
+    statistik -> en StrømStatistik med gennemsnit, varians og kvantiler for ventetiderne, brøkdelen af fly der venter og fordelingen af over_lukketid.
+    
+    Eksempel
+    >>> s = m_dage_strøm(100, 200, rng = np.random.default_rng(1))
+    >>> s.dage, bool(s.p50 <= s.p95 <= s.p99)
+    (100, True)
+    """
+    
+    if statistik is None:
+        statistik = lstat.StrømStatistik()
+    
+    for i in range(0,m): #simulerer en dag ad gangen og glemmer ventetiderne bagefter
+        fly_liste = fly(n,rng,intensitet=intensitet)
+        ventetider, LB = lbm.kø_k(fly_liste[:,0], fly_liste[:,1], k, backend)
+        statistik.opdater_dag(ventetider, len(fly_liste), LB - 13*60*60)
+    
+    return statistik
+
+
+def l_år_strøm(l,m,n,k=1,backend=None,rng=None,vækst=1.05,intensitet=None):
+    """
+    Simulerer l år i lufthavnen med k landingsbaner og løbende statistik for hvert år.
+    Stigningen er på 5% hvert år som standard og udregnes med renteformlen.
+
+    Input
+    l -> antallet af år simuleret.
+    m -> antallet af dage simuleret.
+    n -> skal symbolisere den gennemsnitlige mængde fly.
+    k -> antallet af landingsbaner.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly.
+    vækst -> faktoren som flytrafikken vokser med hvert år.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se _ankomsttider.
+
+    Output
+    liste_statistik -> en liste med en StrømStatistik for hvert år.
+    """
+    
+    return [m_dage_strøm(m,int(n*vækst**i),k,backend,rng,intensitet=intensitet) for i in range(0,l+1)]
+
+
+
+"""
+Syvende sektion indeholder funktioner, som kun simulerer det antal dage der skal til for en given præcision.
+"""
+
+
+def _ci_halv_bredde(x, z):
+    #halve bredde af konfidensintervallet for gennemsnittet af x relativt til gennemsnittet, hvor dage med nan ikke tælles med
+    x = np.asarray(x, dtype = np.float64)
+    x = x[np.isfinite(x)]
+    if len(x) < 2 or np.mean(x) == 0:
+        return np.inf
+    return z*np.std(x, ddof = 1)/np.sqrt(len(x))/abs(np.mean(x))
+
+
+def m_dage_adaptive(n,k=1,rel_ci=0.01,max_days=10000,batch=50,z=1.96,backend=None,rng=None):
+    """
+    Simulerer dage i lufthavnen med k landingsbaner, indtil konfidensintervallerne er smalle nok.
+    Dagene simuleres i bidder af batch dage med m_dage_k. Der stoppes når den halve bredde af konfidensintervallet
+    for den gennemsnitlige ventetid og for brøkdelen af fly der venter begge er højst rel_ci gange gennemsnittet,
+    eller når der er simuleret max_days dage.
+
+    Input
+    n -> skal symbolisere den gennemsnitlige mængde fly.
+    k -> antallet af landingsbaner.
+    rel_ci -> den største relative halve bredde af konfidensintervallerne.
+    max_days -> det største antal dage som simuleres.
+    batch -> antallet af dage som simuleres mellem hvert tjek.
+    z -> kvantilen i normalfordelingen for konfidensintervallet, 1.96 giver 95%.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly.
+
+    Output
+    samme output som m_dage, hvor længden af listerne er antallet af dage som blev brugt.
+    
+    Eksempel
+    >>> ventetider, fly_der_venter, over_lukketid = m_dage_adaptive(200, rel_ci = 0.05, rng = np.random.default_rng(1))
+    >>> len(ventetider)
+    100
+    """
+    
+    liste_mean_ventetider, liste_fly_der_venter, liste_over_lukketid = [], [], [] #setup
+    
+    while len(liste_over_lukketid) < max_days: #simulerer en bid ad gangen
+        ventetider, fly_der_venter, over_lukketid = m_dage_k(min(batch, max_days-len(liste_over_lukketid)),n,k,backend,rng)
+        liste_mean_ventetider.extend(ventetider)
+        liste_fly_der_venter.extend(fly_der_venter)
+        liste_over_lukketid.extend(over_lukketid)
+        
+        if max(_ci_halv_bredde(liste_mean_ventetider, z), _ci_halv_bredde(liste_fly_der_venter, z)) <= rel_ci:
+            break
+    
+    return liste_mean_ventetider, liste_fly_der_venter, liste_over_lukketid
+
+
+def l_år_adaptive(l,n,k=1,rel_ci=0.01,max_days=10000,batch=50,z=1.96,backend=None,rng=None,vækst=1.05):
+    """
+    Simulerer l år i lufthavnen med k landingsbaner, hvor hvert år simuleres med m_dage_adaptive.
+    Stigningen er på 5% hvert år som standard og udregnes med renteformlen.
+
+    Input
+    l -> antallet af år simuleret.
+    n -> skal symbolisere den gennemsnitlige mængde fly.
+    k, rel_ci, max_days, batch, z, backend, rng -> som i m_dage_adaptive.
+    vækst -> faktoren som flytrafikken vokser med hvert år.
+
+    Output
+    liste_ventetider, liste_fly_der_venter, liste_over_lukketid -> som i l_år, men antallet af dage kan være forskelligt hvert år.
+    liste_dage -> en liste med antallet af dage som blev simuleret hvert år.
+    """
+    
+    liste_ventetider, liste_fly_der_venter, liste_over_lukketid, liste_dage = [], [], [], [] #setup
+    
+    for i in range(0,l+1):
+         ventetider, fly_der_venter, over_lukketid = m_dage_adaptive(int(n*vækst**i),k,rel_ci,max_days,batch,z,backend,rng)
+         liste_ventetider.append(ventetider)
+         liste_fly_der_venter.append(fly_der_venter)
+         liste_over_lukketid.append(over_lukketid)
+         liste_dage.append(len(over_lukketid))
+         
+    return liste_ventetider, liste_fly_der_venter, liste_over_lukketid, liste_dage
+
+
+def l_år_2LB_adaptive(l,n,rel_ci=0.01,max_days=10000,batch=50,z=1.96,backend=None,rng=None,vækst=1.05):
+    """
+    Simulerer l år i lufthavnen med to landingsbaner ved at kalde l_år_adaptive, se l_år_adaptive.
+    """
+    
+    return l_år_adaptive(l,n,2,rel_ci,max_days,batch,z,backend,rng,vækst)
+
+
+
+"""
+Ottende sektion indeholder en simulering over flere år, hvor hver dag kun dannes en gang og vokser med nye fly hvert år.
+En poisson proces med lambda = n_(i+1) er en poisson proces med lambda = n_i plus en uafhængig med lambda = n_(i+1) - n_i.
+Derfor kan dagen i år i+1 dannes ved at tilføje nye fly til dagen i år i, og køen genberegnes fra det første nye fly.
+"""
+
+
+_CHECKPOINT = 64 #med flere landingsbaner gemmes landingsbanerne for hvert 64. fly, så køen kan genstartes derfra
+
+
+def _kø_fra_1LB(A, S, D, W, p):
+    #genberegner køen med en landingsbane fra fly p, hvor D og W allerede er rigtige før p
+    LB = D[p-1] if p > 0 else 0
+    C = np.cumsum(S[p:])
+    D[p:] = C + np.maximum(LB, np.maximum.accumulate(A[p:] - (C - S[p:]))) #samme løsning af rekursionen som en_dag_batch
+    LB_før = np.concatenate(([LB], D[p:-1]))
+    W[p:] = np.where(A[p:] < LB_før, LB_før - A[p:], 0)
+    return D[-1] if len(D) > 0 else 0
+
+
+def _kø_fra_k(A, S, W, checkpoints, p, k):
+    #genberegner køen med k landingsbaner fra det sidste checkpoint før fly p
+    c = p // _CHECKPOINT
+    del checkpoints[c+1:]
+    LB = list(checkpoints[c])
+    ventetider = [] #samles i en liste og skrives til W på en gang
+    
+    for i, (a, s) in enumerate(zip(A[c*_CHECKPOINT:].tolist(), S[c*_CHECKPOINT:].tolist()), 1):
+        fri = LB[0]
+        if a < fri: #alle landingsbaner er optaget
+            ventetider.append(fri-a)
+            heapq.heapreplace(LB, fri+s)
+        else:
+            ventetider.append(0)
+            heapq.heapreplace(LB, a+s)
+        if i % _CHECKPOINT == 0:
+            checkpoints.append(tuple(LB))
+    
+    W[c*_CHECKPOINT:] = ventetider
+    return max(LB)
+
+
+def l_år_inkrementel(l,m,n,k=1,vækst=1.05,rng=None,fordeling=None,intensitet=None,timer=13):
+    """
+    Simulerer l år i lufthavnen med k landingsbaner, hvor hver dag dannes en gang og får nye fly hvert år.
+    Det gennemsnitlige antal fly i år i er int(n*vækst**i) ligesom i l_år, men dagene i to år efter hinanden er koblede,
+    så forskellen fra år til år har mindre støj. Det nulte år dannes med fly, og de senere år trækkes kun de nye fly, også med fly.
+
+    Input
+    l -> antallet af år simuleret.
+    m -> antallet af dage simuleret.
+    n -> skal symbolisere den gennemsnitlige mængde fly.
+    k -> antallet af landingsbaner.
+    vækst -> faktoren som flytrafikken vokser med hvert år.
+    rng -> en numpy.random.Generator som flyene trækkes fra, se fly.
+    fordeling -> en fordeling af landingstiderne fra Lufthavns_fordeling_module eller None, se fly.
+    intensitet -> hvordan ankomsterne fordeler sig over dagen, se _ankomsttider.
+    timer -> antallet af timer lufthavnen er åben, se fly.
+
+    Output
+    samme output som l_år, hvor over_lukketid er i forhold til lukketiden efter timer.
+    
+    Eksempel
+    >>> ventetider, fly_der_venter, over_lukketid = l_år_inkrementel(2, 3, 50, rng = np.random.default_rng(1))
+    >>> len(ventetider), len(ventetider[0])
+    (3, 3)
+    """
+    
+    dage = [] #ankomsttider, landingstider, ventetider og tilstanden af køen for hver dag
+    liste_ventetider, liste_fly_der_venter, liste_over_lukketid = [], [], [] #setup
+    
+    for i in range(0,l+1):
+        ventetider, fly_der_venter, over_lukketid = [], [], []
+        
+        for d in range(0,m):
+            if i == 0: #dagen dannes første gang
+                f = fly(n,rng,timer,fordeling=fordeling,intensitet=intensitet)
+                A, S = f[:,0].astype(np.int64), f[:,1].astype(np.int64)
+                p, W = 0, np.zeros(len(A), dtype = np.int64)
+                tilstand = np.zeros(len(A), dtype = np.int64) if k == 1 else [tuple([0]*k)]
+            else: #tilføjer de nye fly i år i til dagen
+                A, S, W, tilstand, LB = dage[d]
+                nye = fly(int(n*vækst**i) - int(n*vækst**(i-1)),rng,timer,fordeling=fordeling,intensitet=intensitet) #de nye fly er sorterede
+                x, nye_A, nye_S = len(nye), nye[:,0].astype(np.int64), nye[:,1].astype(np.int64)
+                
+                plads = np.searchsorted(A, nye_A, side = 'right') + np.arange(x) #de nye flys pladser i den samlede dag
+                gamle = np.ones(len(A)+x, dtype = bool)
+                gamle[plads] = False
+                A_ny, S_ny, W_ny = np.empty(len(A)+x, dtype = np.int64), np.empty(len(A)+x, dtype = np.int64), np.zeros(len(A)+x, dtype = np.int64)
+                A_ny[gamle], A_ny[plads] = A, nye_A
+                S_ny[gamle], S_ny[plads] = S, nye_S
+                W_ny[gamle] = W #ventetiderne før det første nye fly ændres ikke
+                A, S, W = A_ny, S_ny, W_ny
+                p = plads[0] if x > 0 else len(A)
+                if k == 1:
+                    D = np.zeros(len(A), dtype = np.int64)
+                    D[:p] = tilstand[:p]
+                    tilstand = D
+            
+            if k == 1:
+                LB = _kø_fra_1LB(A, S, tilstand, W, p) if p < len(A) else (tilstand[-1] if len(A) > 0 else 0)
+            else:
+                LB = _kø_fra_k(A, S, W, tilstand, p, k) if p < len(A) else LB
+            
+            if i == 0:
+                dage.append([A, S, W, tilstand, LB])
+            else:
+                dage[d] = [A, S, W, tilstand, LB]
+            
+            venter = W[W > 0]
+            ventetider.append(np.mean(venter))
+            fly_der_venter.append(len(venter)/len(A))
+            over_lukketid.append(LB - timer*60*60)
+        
+        liste_ventetider.append(ventetider)
+        liste_fly_der_venter.append(fly_der_venter)
+        liste_over_lukketid.append(over_lukketid)
+    
+    return liste_ventetider, liste_fly_der_venter, liste_over_lukketid
+
+
+
+if os.environ.get('SIM_PROFILE'): #måler hvor tiden går i hele kørslen, se Lufthavns_profil_module
+    import Lufthavns_profil_module
+    Lufthavns_profil_module.start_fra_miljø()
+
+
+
 if  __name__ == '__main__':
    import doctest #doctest tester om alle funktionerne giver samme resultat som eksemplerne
    print(doctest.testmod())
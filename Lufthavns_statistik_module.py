@@ -0,0 +1,312 @@
+"""
+@author: Mikkel Hviid Thorn og Rebekka Engelund Balle
+
+
+Information
+Modulet indeholder løbende statistik til lange simuleringer.
+I stedet for at gemme alle ventetider opdateres nogle få akkumulatorer for hver dag, hvorefter ventetiderne smides væk.
+Hukommelsen er derfor den samme uanset hvor mange dage der simuleres.
+
+Akkumulatorer:
+- Welford -> løbende gennemsnit og varians, som opdateres med en hel dag ad gangen.
+- Histogram -> antal observationer i faste bins, som bruges til kvantiler og fordelinger.
+- StrømStatistik -> samler akkumulatorerne for ventetider, fly der venter og over_lukketid.
+
+Halen af ventetiderne er kvantilerne i HALE over alle fly, også dem som ikke venter, og den største ventetid.
+De udregnes eksakt fra ventetiderne og antallet af fly med hale, eller løbende fra histogrammet i StrømStatistik.
+Fly som ikke venter tælles som nuller, så ventetiderne for dem behøver ikke at blive gemt.
+
+Alle akkumulatorer kan flettes, så statistik fra flere processer kan lægges sammen.
+
+
+Ordbog
+- ventetider er kun ventetider som er forskellige fra nul, som i Lufthavns_simulation_module.
+- kvantil q er den mindste værdi x, hvor mindst brøkdelen q af observationerne er mindre end eller lig x.
+"""
+
+
+import numpy as np
+
+
+HALE = (0.5, 0.9, 0.95, 0.99) #kvantilerne i halen, som hedder p50, p90, p95 og p99
+HALE_NAVNE = tuple(f'p{round(q*100)}' for q in HALE) + ('max',)
+
+
+def _rang(q, total):
+    #rangen af observationen som er kvantil q blandt total observationer, se Ordbog
+    return np.maximum(1, np.ceil(np.round(np.asarray(q, dtype = np.float64)*total, 9))).astype(np.int64)
+
+
+def hale(ventetider, antal_fly, kvantiler=HALE):
+    """
+    Kvantilerne af ventetiderne over alle fly og den største ventetid.
+    Kun de ventetider som skal bruges, findes med np.partition, så hele dagen eller året sorteres ikke.
+
+    Input
+    ventetider -> ventetiderne for de fly som venter.
+    antal_fly -> antallet af fly i alt, hvor antal_fly - len(ventetider) fly ikke venter.
+    kvantiler -> kvantilerne som udregnes.
+
+    Output
+    et float64 array med en værdi for hver kvantil og til sidst den største ventetid. Uden fly er de nan.
+
+    Eksempel
+    >>> hale([30, 10, 20, 40], 10)
+    array([ 0., 30., 40., 40., 40.])
+    >>> hale([], 0)
+    array([nan, nan, nan, nan, nan])
+    """
+
+    ventetider, antal_fly = np.asarray(ventetider), int(antal_fly)
+    if antal_fly == 0:
+        return np.full(len(kvantiler)+1, np.nan)
+
+    nuller = antal_fly - len(ventetider) #fly som ikke venter ligger først i den sorterede rækkefølge
+    indeks = _rang(kvantiler, antal_fly) - 1 - nuller
+    svar = np.zeros(len(kvantiler)+1)
+    venter = indeks >= 0
+    if np.any(venter):
+        svar[:-1][venter] = np.partition(ventetider, np.unique(indeks[venter]))[indeks[venter]]
+    svar[-1] = np.max(ventetider) if len(ventetider) > 0 else 0
+    return svar
+
+
+class Welford:
+    """
+    Løbende gennemsnit og varians med Welfords metode.
+    En hel dag tilføjes på en gang, og dagen flettes ind med Chans formel for at slå to grupper sammen.
+
+    Eksempel
+    >>> w = Welford()
+    >>> w.opdater([1, 2, 3]); w.opdater([4])
+    >>> w.n, float(w.mean), float(w.varians)
+    (4, 2.5, 1.6666666666666667)
+    """
+
+    def __init__(self):
+        self.n, self.mean, self.M2 = 0, 0.0, 0.0
+
+    def _flet(self, n, mean, M2):
+        if n == 0:
+            return
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta*n/total
+        self.M2 += M2 + delta**2*self.n*n/total
+        self.n = total
+
+    def opdater(self, x):
+        #tilføjer observationerne i x
+        x = np.asarray(x, dtype = np.float64)
+        if len(x) > 0:
+            mean = np.mean(x)
+            self._flet(len(x), mean, float(np.sum((x-mean)**2)))
+
+    def flet(self, anden):
+        #lægger en anden Welford akkumulator til denne
+        self._flet(anden.n, anden.mean, anden.M2)
+
+    @property
+    def varians(self):
+        #stikprøvevariansen, som er nan med færre end to observationer
+        return self.M2/(self.n-1) if self.n > 1 else np.nan
+
+
+class Histogram:
+    """
+    Histogram med faste bins af samme bredde fra start og frem.
+    Observationer uden for binsene tælles separat, og den mindste og største observation gemmes.
+    Med bredde 1 og heltal er kvantilerne eksakte, så længe de ligger inden for binsene.
+
+    Input
+    start -> den nedre grænse for den første bin.
+    bredde -> bredden af hver bin.
+    antal_bins -> antallet af bins.
+
+    Eksempel
+    >>> h = Histogram(0, 1, 100)
+    >>> h.opdater([3, 1, 4, 1, 5, 9, 2, 6])
+    >>> int(h.kvantil(0.5)), int(h.kvantil(0.99)), int(h.kvantil(0))
+    (3, 9, 1)
+    """
+
+    def __init__(self, start, bredde, antal_bins):
+        self.start, self.bredde = start, bredde
+        self.antal = np.zeros(antal_bins, dtype = np.int64)
+        self.under, self.over = 0, 0 #observationer før og efter binsene
+        self.min, self.max = np.inf, -np.inf
+
+    def opdater(self, x):
+        #tilføjer observationerne i x
+        x = np.asarray(x)
+        if len(x) == 0:
+            return
+        self.min, self.max = min(self.min, x.min()), max(self.max, x.max())
+        index = np.floor_divide(x - self.start, self.bredde).astype(np.int64)
+        inde = (index >= 0) & (index < len(self.antal))
+        self.under += int(np.count_nonzero(index < 0))
+        self.over += int(np.count_nonzero(index >= len(self.antal)))
+        self.antal += np.bincount(index[inde], minlength = len(self.antal))
+
+    def flet(self, anden):
+        #lægger et andet histogram med de samme bins til dette
+        self.antal += anden.antal
+        self.under, self.over = self.under + anden.under, self.over + anden.over
+        self.min, self.max = min(self.min, anden.min), max(self.max, anden.max)
+
+    @property
+    def total(self):
+        return int(np.sum(self.antal)) + self.under + self.over
+
+    @property
+    def grænser(self):
+        #grænserne for binsene, som kan bruges til at plotte histogrammet
+        return self.start + self.bredde*np.arange(len(self.antal)+1)
+
+    def kvantil(self, q):
+        #kvantilen ud fra den kumulative fordeling, hvor kvantiler uden for binsene giver den mindste eller største observation
+        if self.total == 0:
+            return np.nan
+        return self._værdi(int(_rang(q, self.total)))
+
+    def _værdi(self, rang):
+        #observationen med rangen, altså den rang-mindste observation
+        if rang <= self.under:
+            return self.min
+        i = np.searchsorted(np.cumsum(self.antal), rang - self.under)
+        if i >= len(self.antal):
+            return self.max
+        return self.start + i*self.bredde
+
+
+class StrømStatistik:
+    """
+    Løbende statistik for en række simulerede dage.
+    For hver dag tilføjes ventetiderne, antallet af fly og over_lukketid, hvorefter ventetiderne kan smides væk.
+
+    Statistikken indeholder
+    - gennemsnit, varians og kvantiler for ventetiderne for alle fly som venter.
+    - brøkdelen af alle fly som venter, og gennemsnit og varians af brøkdelen hver dag.
+    - gennemsnit, varians, kvantiler og fordeling af over_lukketid.
+
+    Input
+    max_ventetid -> ventetider op til max_ventetid sekunder tælles i bins på et sekund, så kvantilerne er eksakte.
+    lukketid_bredde -> bredden i sekunder af binsene for over_lukketid, som går fra -13 timer til 13 timer.
+
+    Eksempel
+    >>> s = StrømStatistik()
+    >>> s.opdater_dag([10, 20, 30], 10, -100); s.opdater_dag([40], 5, 50)
+    >>> s.dage, float(s.mean), int(s.p50), s.andel_fly_der_venter, float(s.over_lukketid.mean)
+    (2, 25.0, 20, 0.26666666666666666, -25.0)
+    """
+
+    def __init__(self, max_ventetid=4*60*60, lukketid_bredde=60):
+        self.dage, self.fly, self.fly_der_venter = 0, 0, 0
+        self.ventetider = Welford()
+        self.ventetider_histogram = Histogram(0, 1, max_ventetid+1)
+        self.andel = Welford() #brøkdelen af fly som venter hver dag
+        self.over_lukketid = Welford()
+        self.lukketid_histogram = Histogram(-13*60*60, lukketid_bredde, 2*13*60*60//lukketid_bredde)
+
+    def opdater_dag(self, ventetider, antal_fly, over_lukketid):
+        #tilføjer en dag med ventetider, antal fly og over_lukketid
+        self.dage += 1
+        self.fly += antal_fly
+        self.fly_der_venter += len(ventetider)
+        self.ventetider.opdater(ventetider)
+        self.ventetider_histogram.opdater(ventetider)
+        if antal_fly > 0: #en dag uden fly har ingen brøkdel
+            self.andel.opdater([len(ventetider)/antal_fly])
+        self.over_lukketid.opdater([over_lukketid])
+        self.lukketid_histogram.opdater([over_lukketid])
+
+    def flet(self, anden):
+        #lægger statistik fra en anden StrømStatistik med de samme bins til denne
+        self.dage += anden.dage
+        self.fly += anden.fly
+        self.fly_der_venter += anden.fly_der_venter
+        self.ventetider.flet(anden.ventetider)
+        self.ventetider_histogram.flet(anden.ventetider_histogram)
+        self.andel.flet(anden.andel)
+        self.over_lukketid.flet(anden.over_lukketid)
+        self.lukketid_histogram.flet(anden.lukketid_histogram)
+
+    @property
+    def mean(self):
+        return self.ventetider.mean if self.ventetider.n > 0 else np.nan
+
+    @property
+    def varians(self):
+        return self.ventetider.varians
+
+    @property
+    def p50(self):
+        return self.ventetider_histogram.kvantil(0.5)
+
+    @property
+    def p90(self):
+        return self.ventetider_histogram.kvantil(0.9)
+
+    @property
+    def p95(self):
+        return self.ventetider_histogram.kvantil(0.95)
+
+    @property
+    def p99(self):
+        return self.ventetider_histogram.kvantil(0.99)
+
+    def hale(self):
+        """
+        Halen af ventetiderne over alle fly som i hale, hvor fly som ikke venter tæller som nuller.
+        Kvantilerne er eksakte, så længe ventetiderne er under max_ventetid.
+
+        Output
+        en dictionary med p50, p90, p95, p99 og max for ventetiderne, og over_lukketid_max.
+
+        Eksempel
+        >>> s = StrømStatistik()
+        >>> s.opdater_dag([30, 10], 5, -100); s.opdater_dag([20, 40], 5, 50)
+        >>> s.hale()
+        {'p50': 0, 'p90': 30, 'p95': 40, 'p99': 40, 'max': 40, 'over_lukketid_max': 50}
+        """
+
+        h = self.ventetider_histogram
+        nuller = self.fly - h.total
+        if self.fly == 0:
+            svar = [np.nan]*len(HALE_NAVNE)
+        else: #fly som ikke venter har de laveste rang
+            svar = [0 if rang <= nuller else h._værdi(rang - nuller) for rang in _rang(HALE, self.fly).tolist()]
+            svar.append(h.max if h.total > 0 else 0)
+        svar.append(self.lukketid_histogram.max if self.dage > 0 else np.nan)
+
+        return {navn: (tal.item() if isinstance(tal, np.generic) else tal) for navn, tal in zip(HALE_NAVNE + ('over_lukketid_max',), svar)}
+
+    @property
+    def andel_fly_der_venter(self):
+        return self.fly_der_venter/self.fly if self.fly > 0 else np.nan
+
+    def opsummering(self):
+        """
+        Samler statistikken i en dictionary med tal.
+
+        Output
+        en dictionary med dage, fly, mean, varians, p50, p95, p99, andel_fly_der_venter, andel_mean, andel_varians,
+        over_lukketid_mean, over_lukketid_varians, over_lukketid_p50, over_lukketid_p95 og over_lukketid_max.
+        """
+
+        opsummering = {'dage': self.dage, 'fly': self.fly,
+                'mean': self.mean, 'varians': self.varians, 'p50': self.p50, 'p95': self.p95, 'p99': self.p99,
+                'andel_fly_der_venter': self.andel_fly_der_venter,
+                'andel_mean': self.andel.mean, 'andel_varians': self.andel.varians,
+                'over_lukketid_mean': self.over_lukketid.mean, 'over_lukketid_varians': self.over_lukketid.varians,
+                'over_lukketid_p50': self.lukketid_histogram.kvantil(0.5),
+                'over_lukketid_p95': self.lukketid_histogram.kvantil(0.95),
+                'over_lukketid_max': self.lukketid_histogram.max}
+        
+        return {navn: (tal.item() if isinstance(tal, np.generic) else tal) for navn, tal in opsummering.items()} #almindelige python tal
+
+
+
+if  __name__ == '__main__':
+   import doctest
+   print(doctest.testmod())
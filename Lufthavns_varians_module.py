@@ -0,0 +1,189 @@
+"""
+@author: Mikkel Hviid Thorn og Rebekka Engelund Balle
+
+
+Information
+Modulet sammenligner lufthavnen med forskellige antal landingsbaner med variansreduktion.
+Målet er at få de samme konfidensintervaller med færre simulerede dage.
+
+Metoder:
+- Fælles tilfældige tal -> hver dag simuleres med de samme fly for alle antal landingsbaner, så forskellen mellem dem ikke
+  også indeholder støjen fra to forskellige dage.
+- Antitetiske dage -> flyene dannes med den inverse fordelingsfunktion fra uniforme tal u, og hver dag parres med en dag
+  dannet fra 1-u. Det virker kun når målingen er monoton i u, men ankomsttiderne sorteres, så køen er ikke monoton i u,
+  og parrene giver ikke mindre varians her, se sammenlign. Metoden er derfor slået fra som standard.
+- Kontrolvariat -> antallet af fly X på en dag har den kendte middelværdi n, så Y - beta*(X-n) har samme middelværdi som Y,
+  men mindre varians når Y og X er korrelerede. beta estimeres fra dagene.
+
+
+Ordbog
+- Y er en af målingerne ventetider, fly_der_venter eller over_lukketid for en dag, som i Lufthavns_simulation_module.
+- se er standardfejlen på et gennemsnit.
+- forskel er målingen for ks[0] minus målingen for hvert af de andre antal landingsbaner.
+"""
+
+
+import numpy as np
+import Lufthavns_backend_module as lbm
+import Lufthavns_simulation_module as lsm
+
+
+MÅLINGER = ('ventetider', 'fly_der_venter', 'over_lukketid')
+
+
+def poisson_kvantiler(n, u):
+    """
+    Den inverse fordelingsfunktion for poisson fordelingen med lambda = n i punkterne u.
+
+    Eksempel
+    >>> poisson_kvantiler(3, np.array([0.01, 0.5, 0.99]))
+    array([0, 3, 8])
+    """
+
+    x = np.arange(int(n + 12*np.sqrt(n) + 20)) #dækker alt andet end en forsvindende lille hale
+    log_fakultet = np.concatenate(([0.0], np.cumsum(np.log(x[1:]))))
+    cdf = np.cumsum(np.exp(x*np.log(n) - n - log_fakultet)) if n > 0 else np.ones(len(x))
+    return np.minimum(np.searchsorted(cdf, u, side = 'right'), len(x)-1)
+
+
+def fly_fra_uniforme(n, u_antal, u_ankomst, u_landing):
+    """
+    Danner fly med samme fordeling som Lufthavns_simulation_module.fly ud fra uniforme tal med den inverse fordelingsfunktion.
+    Det første u_ankomst og u_landing bruges til de første fly, så antallet af fly bestemmer hvor mange der bruges.
+
+    Input
+    n -> den gennemsnitlige mængde fly.
+    u_antal -> et uniformt tal som giver antallet af fly.
+    u_ankomst -> et array af uniforme tal som giver ankomsttiderne.
+    u_landing -> et array af uniforme tal som giver landingstiderne.
+
+    Output
+    f -> en liste af fly som fra fly.
+
+    Eksempel
+    >>> fly_fra_uniforme(3, 0.5, np.array([0.9, 0.1, 0.5, 0.3]), np.array([0.0, 0.5, 0.999, 0.2]))
+    array([[ 4680,    31],
+           [23400,    91],
+           [42120,   264]])
+    """
+
+    x = min(int(poisson_kvantiler(n, u_antal)), len(u_ankomst))
+    ankomsttider = np.sort(np.minimum(u_ankomst[:x]*(13*60*60), 13*60*60-1).astype(np.int64))
+    landingstider = lsm._landingstider(np.minimum(u_landing[:x]*(200*29), 200*29-1).astype(np.int64))
+    return np.transpose([ankomsttider,landingstider])
+
+
+def _dag(f, ks, backend):
+    #simulerer de samme fly med hvert antal landingsbaner og giver målingerne som et (len(ks), 3) array
+    målinger = []
+    for k in ks:
+        ventetider, LB = lbm.kø_k(f[:,0], f[:,1], k, backend)
+        mean_ventetid = np.mean(ventetider) if len(ventetider) > 0 else np.nan
+        målinger.append([mean_ventetid, len(ventetider)/max(len(f), 1), LB - 13*60*60])
+    return np.array(målinger, dtype = np.float64)
+
+
+def estimat(Y, X=None, EX=None):
+    """
+    Gennemsnit og standardfejl af observationerne Y, eventuelt korrigeret med kontrolvariatet X med middelværdien EX.
+    Observationer hvor Y er nan tælles ikke med.
+
+    Input
+    Y -> et array af observationer.
+    X -> et array af kontrolvariater for hver observation eller None.
+    EX -> middelværdien af X.
+
+    Output
+    mean -> gennemsnittet.
+    se -> standardfejlen på gennemsnittet.
+
+    Eksempel
+    >>> Y = np.array([3.0, 5.0, 4.0, 6.0])
+    >>> estimat(Y)
+    (4.5, 0.6454972243679028)
+    >>> estimat(Y, np.array([1.0, 3.0, 2.0, 4.0]), 2.5)
+    (4.5, 0.0)
+    """
+
+    maske = np.isfinite(Y)
+    Y = Y[maske]
+    if len(Y) < 2:
+        return (float(Y[0]) if len(Y) == 1 else np.nan), np.nan
+
+    if X is not None and np.var(X[maske]) > 0: #trækker den del af Y fra, som kan forklares med X
+        X = X[maske]
+        beta = np.cov(Y, X)[0,1]/np.var(X, ddof = 1)
+        Y = Y - beta*(X - EX)
+
+    return float(np.mean(Y)), float(np.std(Y, ddof = 1)/np.sqrt(len(Y)))
+
+
+def sammenlign(l,m,n,ks=(1,2),antitetisk=False,kontrolvariat=True,backend=None,rng=None,vækst=1.05):
+    """
+    Simulerer l år i lufthavnen med hvert antal landingsbaner i ks på de samme dage og estimerer målingerne med standardfejl.
+    Stigningen er på 5% hvert år som standard og udregnes med renteformlen.
+
+    Input
+    l -> antallet af år simuleret.
+    m -> antallet af dage simuleret hvert år. Med antitetiske dage er det m//2 par.
+    n -> skal symbolisere den gennemsnitlige mængde fly.
+    ks -> antallene af landingsbaner, som simuleres på de samme fly.
+    antitetisk -> om hver dag parres med en antitetisk dag. Gennemsnittet af et par tæller kun dage hvor et fly venter med
+    i ventetiderne. Parrene giver kun mindre varians når målingen er monoton i de uniforme tal, se Information.
+    kontrolvariat -> om antallet af fly bruges som kontrolvariat.
+    backend -> den backend som kører køen, se Lufthavns_backend_module.vælg_backend.
+    rng -> en numpy.random.Generator som de uniforme tal trækkes fra. Hvis den er None bruges den globale tilstand i
+    numpy.random, som i Lufthavns_simulation_module.
+    vækst -> faktoren som flytrafikken vokser med hvert år.
+
+    Output
+    en dictionary med en dictionary for hver måling i MÅLINGER med arrays
+    mean og se med formen (l+1, len(ks)), og forskel og forskel_se med formen (l+1, len(ks)-1).
+
+    Eksempel
+    >>> r = sammenlign(1, 20, 200, rng = np.random.default_rng(1))
+    >>> r['ventetider']['mean'].shape, r['ventetider']['forskel_se'].shape
+    ((2, 2), (2, 1))
+    """
+
+    if m < (2 if antitetisk else 1):
+        raise ValueError(f'm skal være mindst 2 med antitetiske dage og ellers mindst 1, ikke {m}')
+
+    uniform = np.random.random if rng is None else rng.random
+    resultater = {måling: {'mean': np.empty((l+1, len(ks))), 'se': np.empty((l+1, len(ks))),
+                           'forskel': np.empty((l+1, len(ks)-1)), 'forskel_se': np.empty((l+1, len(ks)-1))}
+                  for måling in MÅLINGER}
+
+    for i in range(0,l+1):
+        n_år = int(n*vækst**i)
+        L = int(n_år + 12*np.sqrt(n_år) + 20) #flere uniforme tal end der nogensinde er fly
+        observationer, antal = [], []
+
+        for d in range(m//2 if antitetisk else m):
+            u_antal, u_ankomst, u_landing = uniform(), uniform(L), uniform(L)
+            dage = [(u_antal, u_ankomst, u_landing)]
+            if antitetisk:
+                dage.append((1-u_antal, 1-u_ankomst, 1-u_landing))
+
+            flyene = [fly_fra_uniforme(n_år, *u) for u in dage]
+            målinger = np.array([_dag(f, ks, backend) for f in flyene])
+            with np.errstate(invalid = 'ignore'): #gennemsnittet af parret, hvor en dag uden ventende fly ikke tæller med
+                observationer.append(np.nansum(målinger, axis = 0)/np.sum(np.isfinite(målinger), axis = 0))
+            antal.append(np.mean([len(f) for f in flyene]))
+
+        observationer, X = np.array(observationer), np.array(antal) if kontrolvariat else None
+
+        for j, måling in enumerate(MÅLINGER):
+            Y = observationer[:,:,j]
+            for a in range(len(ks)):
+                resultater[måling]['mean'][i,a], resultater[måling]['se'][i,a] = estimat(Y[:,a], X, n_år)
+            for a in range(1, len(ks)): #forskellen på de samme dage, så støjen fra dagene går ud
+                resultater[måling]['forskel'][i,a-1], resultater[måling]['forskel_se'][i,a-1] = estimat(Y[:,0] - Y[:,a], X, n_år)
+
+    return resultater
+
+
+
+if  __name__ == '__main__':
+   import doctest
+   print(doctest.testmod())
@@ -0,0 +1,150 @@
+"""
+@author: Mikkel Hviid Thorn
+
+Minesweeper solver and a benchmark which plays many games with it
+
+The solver only uses what a player can see, Game.view, and the number of bombs.
+- flags hidden elements next to a number which needs all its hidden neighbours as bombs
+- clears hidden elements next to a number which already has all its bombs flagged
+- compares pairs of numbers, where the hidden neighbours of one are a subset of the hidden neighbours of the other
+- otherwise guesses the element with the smallest estimated probability of a bomb
+
+The benchmark plays seeded games in several processes and reports win rate, games per second and time per move.
+python minesweeper_solver.py --games 2000 --size 16 16 --bombs 40
+"""
+
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from minesweeper_v2 import Game, neighbour_sum, UNKNOWN, FLAG
+
+
+def certain_moves(v):
+    # the elements which are certainly bombs and certainly safe, found from each number and its neighbours
+    hidden, numbers = v == UNKNOWN, v >= 0
+    n_hidden, rest = neighbour_sum(hidden), v - neighbour_sum(v == FLAG)  # rest is the bombs a number still misses
+    done = numbers & (n_hidden > 0) & (rest == 0)
+    full = numbers & (n_hidden > 0) & (rest == n_hidden)
+    return hidden & (neighbour_sum(full) > 0), hidden & (neighbour_sum(done) > 0)
+
+
+def constraints(v):
+    # each number with hidden neighbours as (set of hidden neighbours, bombs it still misses)
+    x, y = v.shape
+    rest = v - neighbour_sum(v == FLAG)
+    l = []
+    for i, j in zip(*np.nonzero((v >= 0) & (neighbour_sum(v == UNKNOWN) > 0))):
+        cells = frozenset((k, m) for k in range(max(i - 1, 0), min(i + 2, x)) for m in range(max(j - 1, 0), min(j + 2, y))
+                          if v[k, m] == UNKNOWN)
+        l.append((cells, int(rest[i, j])))
+    return l
+
+
+def subset_moves(l):
+    # if the hidden neighbours A of one number is a subset of the hidden neighbours B of another,
+    # then B minus A has the difference in missing bombs
+    bombs, safe = set(), set()
+    by_cell = {}
+    for k, (cells, r) in enumerate(l):
+        for c in cells:
+            by_cell.setdefault(c, []).append(k)
+    for k, (a, ra) in enumerate(l):
+        for n in {n for c in a for n in by_cell[c]} - {k}:  # only numbers which share a hidden neighbour
+            b, rb = l[n]
+            if a < b:
+                diff = b - a
+                if rb - ra == 0:
+                    safe |= diff
+                elif rb - ra == len(diff):
+                    bombs |= diff
+    return bombs, safe
+
+
+def guess(v, l, antal):
+    # the hidden element with the smallest estimated probability of a bomb. Next to numbers the estimate is the
+    # largest missing bombs divided by hidden neighbours, elsewhere it is the density of the bombs not flagged
+    hidden = v == UNKNOWN
+    if not np.any(v >= 0):  # first move, the middle gives the largest area if the first click is safe
+        return v.shape[0] // 2, v.shape[1] // 2
+    p = np.full(v.shape, (antal - np.count_nonzero(v == FLAG)) / max(np.count_nonzero(hidden), 1))
+    border = np.zeros(v.shape)
+    for cells, r in l:
+        for c in cells:
+            border[c] = max(border[c], r / len(cells))
+    p = np.where(border > 0, border, p)
+    p[~hidden] = np.inf
+    return np.unravel_index(np.argmin(p), v.shape)
+
+
+def next_moves(v, antal):
+    # the next moves as a list of ('c', i, j) for clear and ('f', i, j) for flag
+    bombs, safe = certain_moves(v)
+    moves = [('f', i, j) for i, j in zip(*np.nonzero(bombs))] + [('c', i, j) for i, j in zip(*np.nonzero(safe))]
+    if moves:
+        return moves
+    l = constraints(v)
+    bombs, safe = subset_moves(l)
+    moves = [('f', i, j) for i, j in sorted(bombs)] + [('c', i, j) for i, j in sorted(safe)]
+    if moves:
+        return moves
+    return [('c', *guess(v, l, antal))]
+
+
+def solve(game):
+    # plays the game until it is won or lost, gives the result and the seconds spent in the game itself
+    engine = 0.0
+    while game.result is None:
+        for choice, i, j in next_moves(game.view(), game.antal):
+            t = time.perf_counter()
+            result = game.flag(i, j) if choice == 'f' else game.clear(i, j)
+            engine += time.perf_counter() - t
+            if result is not None:
+                break
+    return game.result, engine
+
+
+def play(task):
+    # plays one seeded game and gives (won, moves, seconds, seconds in the game itself)
+    x, y, antal, seed, first_click_safe = task
+    t = time.perf_counter()
+    game = Game(x, y, antal, seed, first_click_safe)
+    result, engine = solve(game)
+    return result == 'won', game.moves, time.perf_counter() - t, engine
+
+
+def batch(games, x=16, y=16, antal=40, seed=1, workers=None, first_click_safe=True):
+    # plays a number of seeded games in worker processes, with workers = 1 in this process
+    # each game gets its own seed from seed, so the results do not depend on the number of workers
+    tasks = [(x, y, antal, s, first_click_safe) for s in np.random.SeedSequence(seed).spawn(games)]
+    t = time.perf_counter()
+    if workers == 1:
+        svar = list(map(play, tasks))
+    else:
+        workers = workers or os.cpu_count()
+        with ProcessPoolExecutor(workers) as pool:
+            svar = list(pool.map(play, tasks, chunksize=max(1, games // (4 * workers))))
+    seconds = time.perf_counter() - t
+
+    won, moves, game_seconds, engine = (np.array(a) for a in zip(*svar))
+    return {'games': games, 'wins': int(won.sum()), 'win_rate': float(won.mean()),
+            'games_per_second': games / seconds, 'moves': int(moves.sum()),
+            'seconds_per_move': float(game_seconds.sum() / moves.sum()),
+            'engine_seconds_per_move': float(engine.sum() / moves.sum())}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Plays seeded minesweeper games with the solver and reports the speed.')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--size', type=int, nargs=2, default=[16, 16], metavar=('X', 'Y'))
+    parser.add_argument('--bombs', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=None, help='number of processes, 1 plays in this process')
+    parser.add_argument('--unsafe', action='store_true', help='the first click can hit a bomb')
+    args = parser.parse_args()
+
+    report = batch(args.games, *args.size, args.bombs, args.seed, args.workers, not args.unsafe)
+    for name, value in report.items():
+        print(f'{name:>24}: {value:.6g}' if isinstance(value, float) else f'{name:>24}: {value}')
+
@@ -4,175 +4,287 @@
 Minesweeper
 """
 
-from random import randint #so one can make random integers
-
-
-def make_list(a, x, y):
-    # makes x times y array
-    l = []
-    for i in range(0, x):
-        l += [[]]
-        for j in range(0, y):
-            l[i] += [a]
-    return l
-
-
-def neighbours(x, y):
-    # makes a list of the neighbours for each element in an x times y array
-    d = dict()
-    for i in range(0, x):
-        for j in range(0, y):
-            d[i, j] = []  # there are 8 possible neighbours in the 2d grid, therefore 8 conditions
-            if i < x - 1:
-                d[i, j].append((i + 1, j))
-            if i > 0:
-                d[i, j].append((i - 1, j))
-            if j < y - 1:
-                d[i, j].append((i, j + 1))
-            if j > 0:
-                d[i, j].append((i, j - 1))
-            if i < x - 1 and j < y - 1:
-                d[i, j].append((i + 1, j + 1))
-            if i > 0 and j < y - 1:
-                d[i, j].append((i - 1, j + 1))
-            if i < x - 1 and j > 0:
-                d[i, j].append((i + 1, j - 1))
-            if i > 0 and j > 0:
-                d[i, j].append((i - 1, j - 1))
-    return d
-
-
-def place_bombs(x, y, antal):
+import sys
+import numpy as np
+
+HIDDEN, REVEALED, FLAGGED, MINE, EDGE = 0, 1, 2, 4, 8  # bits in the state of a cell
+UNKNOWN, FLAG = -1, -2  # hidden and flagged elements in Game.view
+
+
+class Board:
+    # an x times y board stored in flat numpy arrays with an extra border of edge cells around it,
+    # so every cell p has the 8 neighbours p + offsets and no bounds have to be checked
+    def __init__(self, x, y):
+        self.x, self.y, self.w = x, y, y + 2
+        self.counts = np.zeros((x + 2) * (y + 2), dtype=np.int8)  # number of neighbouring bombs
+        self.state = np.full((x + 2) * (y + 2), EDGE, dtype=np.uint8)
+        self.grid(self.state)[:] = HIDDEN
+        w = self.w  # the neighbours in the same order as the old neighbours dict
+        self.offsets = np.array([w, -w, 1, -1, w + 1, -w + 1, w - 1, -w - 1])
+        # hidden elements without bomb and right and wrong flags, kept up to date for the win condition
+        self.hidden_safe, self.right_flags, self.wrong_flags = x * y, 0, 0
+        self.rows, self.dirty = [''] * y, np.ones(y, dtype=bool)  # the rows of the last frame and which have changed
+
+    def index(self, i, j):
+        # flat index of the element (i, j) in the x times y array
+        return (i + 1) * self.w + j + 1
+
+    def grid(self, a):
+        # view of a flat array as the x times y array without the border
+        return a.reshape(self.x + 2, self.y + 2)[1:-1, 1:-1]
+
+    def count(self):
+        # counts the hidden elements without bomb and the right and wrong flags from scratch, e.g. after placing bombs
+        state = self.grid(self.state)
+        mine, flag = state & MINE > 0, state & FLAGGED > 0
+        self.hidden_safe = int(np.count_nonzero(~mine & (state & (REVEALED | FLAGGED) == 0)))
+        self.right_flags = int(np.count_nonzero(mine & flag))
+        self.wrong_flags = int(np.count_nonzero(~mine & flag))
+
+    def flag(self, p):
+        # flags the element or removes the flag, which hides the element again as on the old board
+        s = self.state[p]
+        mine = s & MINE
+        if s & FLAGGED:
+            self.state[p] = mine
+            if mine:
+                self.right_flags -= 1
+            else:
+                self.wrong_flags, self.hidden_safe = self.wrong_flags - 1, self.hidden_safe + 1
+        else:
+            self.state[p] = mine | FLAGGED
+            if mine:
+                self.right_flags += 1
+            else:
+                self.wrong_flags, self.hidden_safe = self.wrong_flags + 1, self.hidden_safe - (0 if s & REVEALED else 1)
+        self.dirty[p % self.w - 1] = True
+
+    def component(self, p):
+        # the elements with indication 0 and no bomb which are connected to the element p with indication 0,
+        # found one layer at a time from p like clear, so only the clicked component is visited
+        seen = np.zeros(len(self.state), dtype=bool)
+        seen[p] = True
+        layer, elements = np.array([p]), [np.array([p])]
+        while len(layer) > 0:
+            ld = (layer[:, None] + self.offsets).ravel()
+            ld = ld[~seen[ld] & (self.counts[ld] == 0) & (self.state[ld] & (MINE | EDGE) == 0)]
+            layer = np.unique(ld)
+            seen[layer] = True
+            elements.append(layer)
+        return np.concatenate(elements)
+
+    def clear(self, p):
+        # reveals the element and clears the neighbours of each revealed element if they meet certain requirement,
+        # one layer of revealed elements at a time instead of recursion
+        # gives the number of elements revealed
+        state = self.state
+        layer = np.array([p])
+        revealed = [] if state[p] & REVEALED else [layer]  # the elements revealed now, all without bomb
+        # reveals the whole component and its border in one go, only if none of it is revealed, so a revealed element costs nothing
+        if self.counts[p] == 0 and not state[p] & (MINE | REVEALED):
+            zeros = self.component(p)
+            if not np.any(state[zeros] & REVEALED):
+                ld = (zeros[:, None] + self.offsets).ravel()  # the component and its border, some of them more than once
+                if not np.any(state[ld] & FLAGGED):  # else flags can stop the clearing
+                    ld = ld[state[ld] & (REVEALED | EDGE) == 0]
+                    layer = np.unique(ld[self.counts[ld] != 0])  # the border, whose neighbours can be cleared
+                    state[ld] |= REVEALED
+                    state[zeros] |= REVEALED
+                    revealed = [zeros, layer]
+        state[p] |= REVEALED
+        while len(layer) > 0:
+            ld = layer[:, None] + self.offsets
+            no_x = ~np.any(state[ld] & (MINE | FLAGGED) == MINE, axis=1)  # no unknown neighbouring bomb, always for 0
+            ld = ld[no_x].ravel()
+            layer = np.unique(ld[state[ld] & (REVEALED | FLAGGED | EDGE) == 0])
+            state[layer] |= REVEALED
+            revealed.append(layer)
+
+        n = sum(len(r) for r in revealed)
+        self.hidden_safe -= n
+        for r in revealed:
+            self.dirty[r % self.w - 1] = True
+        return n
+
+    def symbols(self, show_all=False):
+        # the x times y array of what is shown in each element, '#' hidden, 'F' flag, 'X' bomb or the indication
+        return shown(self.grid(self.state), self.grid(self.counts), show_all)
+
+    def frame(self):
+        # the board as the string printed by print_board, where only the rows changed since the last frame are made again
+        state, counts = self.state.reshape(self.x + 2, self.y + 2), self.counts.reshape(self.x + 2, self.y + 2)
+        for i in np.flatnonzero(self.dirty):
+            self.rows[i] = board_row(i, shown(state[1:-1, i + 1], counts[1:-1, i + 1]))
+        self.dirty[:] = False
+        return board_frame(self.rows, self.x)
+
+
+def shown(state, counts, show_all=False):
+    # what is shown in elements with the state and counts, '#' hidden, 'F' flag, 'X' bomb or the indication
+    l = np.where(state & MINE, 'X', counts.astype(str))
+    if show_all:
+        return l
+    return np.where(state & FLAGGED, 'F', np.where(state & REVEALED, l, '#'))
+
+
+def neighbour_sum(a):
+    # the sum of the 8 neighbours of each element in an x times y array, by summing the 8 shifted arrays
+    x, y = a.shape
+    a = np.pad(a, 1).astype(np.int8)
+    s = np.zeros((x, y), dtype=np.int8)
+    for di, dj in ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1)):
+        s += a[1 + di:x + 1 + di, 1 + dj:y + 1 + dj]
+    return s
+
+
+def place_bombs(x, y, antal, seed=None, safe=None, b=None):
     # places bombs in the x times y array and adds indication to each neighbouring element
-    neighbour_dict = neighbours(x, y)
-    b, k = make_list(0, x, y), 0
-    while k < antal:
-        m, n = randint(0, x - 1), randint(0, y - 1)  # choosing bomb coordinates
-        if b[m][n] != 'X':
-            b[m][n] = 'X'
-            ld = neighbour_dict[m, n]
-            for i, j in ld:  # adds 1 to each neighbour of the chosen bomb location
-                if b[i][j] != 'X':
-                    b[i][j] += 1
-            k += 1
+    # seed is a seed or a numpy Generator, safe is an element (i, j) which gets no bomb and if there is room neither do
+    # its neighbours, and b is a board without bombs to place them on, e.g. one with flags
+    b = Board(x, y) if b is None else b
+    free = np.ones((x, y), dtype=bool)  # elements where a bomb can be placed
+    if safe is not None:
+        i, j = safe
+        free[max(i - 1, 0):i + 2, max(j - 1, 0):j + 2] = False
+        if antal > np.count_nonzero(free):  # not room to keep the neighbours free
+            free[:] = True
+            free[i, j] = False
+    if antal > np.count_nonzero(free):
+        raise ValueError(f'there is only room for {np.count_nonzero(free)} bombs on the {x} times {y} board')
+
+    bombs = np.zeros(x * y, dtype=bool)  # choosing bomb coordinates, all at once without replacement
+    bombs[np.random.default_rng(seed).choice(np.flatnonzero(free), antal, replace=False)] = True
+    bombs = bombs.reshape(x, y)
+    b.grid(b.state)[bombs] |= MINE
+    b.grid(b.counts)[:] = neighbour_sum(bombs)  # adds 1 to each neighbour of the bombs
+    b.count()
     return b
 
 
-def clear(ms, b, m, n, x, y):
-    # clears the neighbours of an element if they meet certain requirement
-    neighbour_dict = neighbours(x, y)
-    ld, no_x = neighbour_dict[m, n], True
-    if b[m][n] == 0:  # clears if element has indication 0, therefore no bombs
-        for i, j in ld:
-            if b[i][j] != 'X' and ms[i][j] == '#':
-                ms[i][j] = b[i][j]
-                ms = clear(ms, b, i, j, x, y)
-    elif b[m][n] in [1, 2, 3, 4, 5, 6, 7, 8]:  # checks if element has unknown bomb as neighbour
-        for i, j in ld:
-            if b[i][j] == 'X' and ms[i][j] == '#':
-                no_x = False
-    if no_x:  # clears if element has no unknown neighbouring bomb
-        for i, j in ld:
-            if ms[i][j] == '#':
-                ms[i][j] = b[i][j]
-                ms = clear(ms, b, i, j, x, y)
-    return ms
+class Game:
+    # the rules of minesweeper without input or output, so a game can be played from the prompts or by a program
+    # clear and flag take the element (i, j) and give 'won' or 'lost' when the game is over, otherwise None
+    # with first_click_safe the bombs are first placed at the first clear, away from the chosen element
+    def __init__(self, x, y, antal, seed=None, first_click_safe=False):
+        self.x, self.y, self.antal = x, y, antal
+        self.rng = np.random.default_rng(seed)
+        self.board = Board(x, y) if first_click_safe else place_bombs(x, y, antal, self.rng)
+        self.placed = not first_click_safe
+        self.result, self.moves = None, 0
+
+    def flag(self, i, j):
+        # flags the element or removes the flag
+        if self.result is None:
+            self.moves += 1
+            self.board.flag(self.board.index(i, j))
+            self.check()
+        return self.result
+
+    def clear(self, i, j):
+        # clears the element, and its neighbours if they meet the requirement
+        if self.result is not None:
+            return self.result
+        self.moves += 1
+        b, p = self.board, self.board.index(i, j)
+        if b.state[p] & FLAGGED:  # a flagged element can not be cleared
+            return self.result
+        if not self.placed:  # first clear in first click safe mode
+            place_bombs(self.x, self.y, self.antal, self.rng, (i, j), b)
+            self.placed = True
+        if b.state[p] & MINE:  # chose bomb
+            self.result = 'lost'
+            return self.result
+        b.clear(p)
+        return self.check()
+
+    def check(self):
+        # checks the win conditions
+        if not self.placed:  # no bombs yet, so the game can not be won
+            return self.result
+        b = self.board
+        #checks if all bombs are flagged and no numbers are flagged, or if all numbers are clear or flagged
+        if b.right_flags == self.antal and b.wrong_flags == 0 or b.hidden_safe == 0:
+            self.result = 'won'
+        return self.result
+
+    def view(self):
+        # what the player can see as an int8 x times y array, with UNKNOWN for hidden elements, FLAG for flags
+        # and otherwise the indication
+        state = self.board.grid(self.board.state)
+        v = self.board.grid(self.board.counts).copy()
+        v[state & REVEALED == 0] = UNKNOWN
+        v[state & FLAGGED > 0] = FLAG
+        return v
+
+
+def board_row(i, l):
+    # row i of the board, where l is what is shown in each element of the row
+    return f'\n   |\n {i + 1} |' + ''.join(f' {s} ' for s in l)
+
+
+def board_frame(rows, x):
+    # the whole board as one string from its rows
+    return ' 0 |' + ''.join(f' {i} ' for i in range(1, x + 1)) + '\n' + '-' * 3 + '+' + '-' * 3 * x + ''.join(rows) + '\n\n'
 
 
 def print_board(l, x, y):
-    # prints the board for an x times y array
-    print(' 0 |', end='')
-    for i in range(1,x+1): #x axis
-        print(f' {i} ', end='')
-    print('\n'+'-'*3+'+'+'-'*3*x, end='')
-    for i in range(1,y+1): #y axis
-        print('\n   |')
-        print(f' {i} |', end='')
-        for j in range(0,x): #the board
-            print(f' {l[j][i-1]} ', end='')
-    return print('\n')
-    
-
-def minesweeper(x, y, antal):
+    # prints the board for an x times y array, made as one string and written at once
+    l = np.asarray(l)
+    sys.stdout.write(board_frame([board_row(i, l[:, i]) for i in range(y)], x))
+
+
+def minesweeper(x, y, antal, seed=None, first_click_safe=False):
     # plays minesweeper / setup first
-    # ms is the visual board, b is the bombs and numbers
-    ms, b, bombs, numbers = make_list('#', x, y), place_bombs(x, y, antal), [], []
+    # g is the game with the board, which has the bombs, numbers and what is shown
+    g = Game(x, y, antal, seed, first_click_safe)
     x_placements, y_placements = [f'{i}' for i in range(1, x + 1)], [f'{j}' for j in range(1, y + 1)]
-    
-    for i in range(0, x):  # saves location of bombs and numbers, used in win condition
-        for j in range(0, y):
-            if b[i][j] == 'X':
-                bombs += [[i,j]]
-            else:
-                numbers += [[i,j]]
-    
+
     while True:  # plays minesweeper
-        print_board(ms, x, y)
-        
+        sys.stdout.write(g.board.frame())  # only the rows which have changed are made again
+
         while True:  # input for left (clear) or right (flag) click
             choice = input('Clear (c) or flag (f):')
             if choice in ['c', 'f']:
                 break
-            
+
         while True:  # input for coordinate of the point
             coor = input('Coordinates (x,y):')
             c = coor.split(',')
             if len(c) == 2 and c[0] in x_placements and c[1] in y_placements:
                 c = int(c[0]) - 1, int(c[1]) - 1
                 break
-        
+
         if choice == 'f':  # if choosing flag
-            if ms[c[0]][c[1]] != 'F':
-                ms[c[0]][c[1]] = 'F'
-            elif ms[c[0]][c[1]] == 'F':
-                ms[c[0]][c[1]] = '#'
-        
-        if choice == 'c':  # if choosing clear
-            if ms[c[0]][c[1]] != 'F' and b[c[0]][c[1]] == 'X': #chose bomb
-                print_board(b, x, y)
-                return print('You lost')
-            elif ms[c[0]][c[1]] != 'F': #didn't choose bomb
-                ms[c[0]][c[1]] = b[c[0]][c[1]]
-                clear(ms, b, c[0], c[1], x, y)
-        
-        win = True
-        for bomb in bombs: #checks if all bombs are flagged
-            if ms[bomb[0]][bomb[1]] == '#':
-                win = False
-        for number in numbers:
-            if ms[number[0]][number[1]] == 'F':
-                win = False
-        
-        if win == True: #meeting win condition
-            print_board(ms, x, y)
-            return print('You won')
-        
-        win = True
-        for number in numbers: #checks if all numbers are clear
-            if ms[number[0]][number[1]] == '#':
-                win = False
-        
-        if win == True: #meeting win condition
-            print_board(ms, x, y)
+            result = g.flag(*c)
+        else:  # if choosing clear
+            result = g.clear(*c)
+
+        if result == 'lost': #chose bomb
+            print_board(g.board.symbols(True), x, y)
+            return print('You lost')
+        if result == 'won': #meeting win condition
+            sys.stdout.write(g.board.frame())
             return print('You won')
 
 
-play = 'y'
-while play == 'y':
-    
-    while True:  # input yes or no
-        play = input('Play minesweeper (y/n):')
-        if play in ['y', 'n']:
-            break
-    
-    if play == 'n':
-        break
-        
-    while True:
-        options = input('Options for the game (length, width, number of bombs):')
-        options = options.split(',')
-        if options[0].isnumeric() == True and options[1].isnumeric() == True and options[2].isnumeric() == True:
-            options = int(options[0]), int(options[1]), int(options[2])
+if __name__ == '__main__':  # the game is only played when the file is run, not when it is imported
+    play = 'y'
+    while play == 'y':
+
+        while True:  # input yes or no
+            play = input('Play minesweeper (y/n):')
+            if play in ['y', 'n']:
+                break
+
+        if play == 'n':
             break
-        
-    minesweeper(options[0], options[1], options[2])
+
+        while True:
+            options = input('Options for the game (length, width, number of bombs):')
+            options = options.split(',')
+            if options[0].isnumeric() == True and options[1].isnumeric() == True and options[2].isnumeric() == True:
+                options = int(options[0]), int(options[1]), int(options[2])
+                if options[2] <= options[0] * options[1]:  # room for the bombs
+                    break
+
+        minesweeper(options[0], options[1], options[2])